@@ -0,0 +1,177 @@
+# admission.py
+"""
+모더레이션(AI 추론)을 타는 쓰기 요청의 입장 제어.
+
+- 사용자별 / 전역 토큰 버킷으로 요청 속도 제한 -> 429
+- 동시에 진행 중인 추론 수 제한 -> 503
+- 게시글 작성이 댓글보다 우선 (댓글은 동시 실행 슬롯과 전역 토큰 중 일부만 사용 가능)
+거절 시 Retry-After(초)를 함께 돌려준다.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+PRIORITY_POST = "post"
+PRIORITY_COMMENT = "comment"
+
+USER_RATE = float(os.getenv("ADMISSION_USER_RATE", "0.5"))        # 사용자별 초당 토큰
+USER_BURST = float(os.getenv("ADMISSION_USER_BURST", "5"))
+GLOBAL_RATE = float(os.getenv("ADMISSION_GLOBAL_RATE", "50"))     # 전체 초당 토큰
+GLOBAL_BURST = float(os.getenv("ADMISSION_GLOBAL_BURST", "100"))
+MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "8"))
+# 게시글 작성용으로 항상 비워두는 슬롯 수 (댓글은 MAX_INFLIGHT - POST_RESERVED 까지만)
+POST_RESERVED = int(os.getenv("ADMISSION_POST_RESERVED", "2"))
+# 전역 토큰 중 게시글 작성용으로 남겨두는 비율 (댓글은 이 아래로 가져갈 수 없다)
+POST_GLOBAL_RESERVE = float(os.getenv("ADMISSION_POST_GLOBAL_RESERVE", "0.2"))
+MAX_TRACKED_USERS = 10_000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self, n: float = 1.0, floor: float = 0.0) -> float:
+        """
+        토큰을 가져가면 0, 부족하면 다시 시도할 때까지 기다릴 시간(초).
+        floor: 가져간 뒤에도 이만큼은 남아 있어야 한다. (우선순위가 낮은 요청용)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens - n >= floor:
+                self.tokens -= n
+                return 0.0
+            return (n + floor - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+    def refund(self, n: float = 1.0):
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + n)
+
+
+class InflightLimiter:
+    """우선순위별 상한이 있는 동시 실행 카운터."""
+
+    def __init__(self, max_inflight: int, post_reserved: int):
+        self.limits = {
+            PRIORITY_POST: max_inflight,
+            PRIORITY_COMMENT: max(max_inflight - post_reserved, 1),
+        }
+        self.inflight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, priority: str) -> bool:
+        with self._lock:
+            if self.inflight >= self.limits[priority]:
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+
+
+class Decision:
+    __slots__ = ("admitted", "status_code", "reason", "retry_after", "_holds_slot")
+
+    def __init__(self, admitted: bool, status_code: int = 200, reason: Optional[str] = None,
+                 retry_after: int = 0, holds_slot: bool = False):
+        self.admitted = admitted
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+        self._holds_slot = holds_slot
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        user_rate: float = USER_RATE,
+        user_burst: float = USER_BURST,
+        global_rate: float = GLOBAL_RATE,
+        global_burst: float = GLOBAL_BURST,
+        max_inflight: int = MAX_INFLIGHT,
+        post_reserved: int = POST_RESERVED,
+        post_global_reserve: float = POST_GLOBAL_RESERVE,
+    ):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        # 댓글 폭주가 전역 토큰을 다 써도 게시글 작성 몫은 남도록
+        self.global_floor = {
+            PRIORITY_POST: 0.0,
+            PRIORITY_COMMENT: global_burst * post_global_reserve,
+        }
+        self.inflight = InflightLimiter(max_inflight, post_reserved)
+
+        # author_id -> TokenBucket (LRU로 개수 제한). 락은 조회/삽입에만 잡는다.
+        self._users: "OrderedDict[Any, TokenBucket]" = OrderedDict()
+        self._users_lock = threading.Lock()
+
+        self._counters: Dict[str, int] = {}
+        self._counters_lock = threading.Lock()
+
+    def _user_bucket(self, author_id) -> TokenBucket:
+        with self._users_lock:
+            bucket = self._users.get(author_id)
+            if bucket is None:
+                bucket = TokenBucket(self.user_rate, self.user_burst)
+                self._users[author_id] = bucket
+                if len(self._users) > MAX_TRACKED_USERS:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(author_id)
+            return bucket
+
+    def _count(self, priority: str, outcome: str):
+        key = f"{priority}.{outcome}"
+        with self._counters_lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def try_admit(self, author_id, priority: str) -> Decision:
+        if not self.inflight.try_acquire(priority):
+            self._count(priority, "rejected_overloaded")
+            return Decision(False, 503, "overloaded", retry_after=1)
+
+        user_bucket = self._user_bucket(author_id)
+        wait = user_bucket.try_take()
+        if wait > 0:
+            self.inflight.release()
+            self._count(priority, "rejected_user_rate")
+            return Decision(False, 429, "rate_limited", retry_after=math.ceil(wait))
+
+        wait = self.global_bucket.try_take(floor=self.global_floor[priority])
+        if wait > 0:
+            user_bucket.refund()
+            self.inflight.release()
+            self._count(priority, "rejected_global_rate")
+            return Decision(False, 429, "rate_limited", retry_after=math.ceil(wait))
+
+        self._count(priority, "admitted")
+        return Decision(True, holds_slot=True)
+
+    def release(self, decision: Decision):
+        if decision._holds_slot:
+            decision._holds_slot = False
+            self.inflight.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {
+            "counters": counters,
+            "inflight": self.inflight.inflight,
+            "max_inflight": self.inflight.limits,
+            "tracked_users": len(self._users),
+        }
+
+
+admission = AdmissionController()
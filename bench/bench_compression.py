@@ -0,0 +1,140 @@
+# bench/bench_compression.py
+"""
+응답 압축 벤치마크: 인코딩/레벨별 전송 바이트와 요청당 CPU 시간.
+
+- middleware: 매 요청 JSONResponse 를 CompressionMiddleware 가 압축
+- replay: 캐시된 응답을 PrecompressedResponse 로 재생 (압축본 재사용)
+페이로드는 GET /posts/{id} 응답 모양(본문 + 댓글 N개)을 흉내 낸다.
+
+실행:
+    python bench/bench_compression.py --comments 20 200 --requests 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.responses import JSONResponse, Response  # noqa: E402
+
+import compression  # noqa: E402
+from compression import CompressedVariants, CompressionMiddleware, PrecompressedResponse  # noqa: E402
+
+
+def make_payload(n_comments: int) -> dict:
+    return {
+        "message": "detail_ok",
+        "data": {
+            "id": 1,
+            "title": "벤치마크용 게시글 제목",
+            "body": "오늘은 압축 벤치마크를 위한 긴 본문을 작성합니다. " * 60,
+            "author": "dami",
+            "created_at": "2025-01-01 00:00:00",
+            "views": 12345,
+            "views_display": "10k",
+            "comments_count": n_comments,
+            "comments_count_display": str(n_comments),
+            "likes": 0,
+            "comments": [
+                {
+                    "comment_id": i,
+                    "author": f"user{i % 37}",
+                    "content": f"{i}번째 댓글입니다. 좋은 글 감사합니다!",
+                    "created_at": "2025-01-01 00:00:00",
+                }
+                for i in range(n_comments)
+            ],
+        },
+    }
+
+
+def _scope(accept_encoding: str) -> dict:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/posts/1",
+        "raw_path": b"/posts/1",
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "http_version": "1.1",
+        "server": ("bench", 80),
+        "headers": headers,
+    }
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _serve(app, accept_encoding: str) -> int:
+    sent = 0
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    await app(_scope(accept_encoding), _receive, send)
+    return sent
+
+
+def measure(make_app, accept_encoding: str, requests: int):
+    async def run():
+        wire = 0
+        cpu_begin = time.process_time()
+        for _ in range(requests):
+            wire = await _serve(make_app(), accept_encoding)
+        return wire, (time.process_time() - cpu_begin) / requests
+
+    return asyncio.run(run())
+
+
+def configs():
+    yield "identity", "", None
+    for level in (1, 5, 9):
+        yield f"gzip-{level}", "gzip", ("GZIP_LEVEL", level)
+    if compression.brotli is not None:
+        for quality in (1, 4, 11):
+            yield f"br-{quality}", "br", ("BROTLI_QUALITY", quality)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--comments", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    if compression.brotli is None:
+        print("brotli not installed: gzip only")
+
+    for n_comments in args.comments:
+        # JSON 직렬화 비용은 빼고 압축 비용만 보도록 본문은 한 번만 만든다.
+        raw = JSONResponse(make_payload(n_comments)).body
+        raw_size = len(raw)
+        print(f"\n== {n_comments} comments, {raw_size} bytes raw ==")
+        print(f"{'encoding':<10}{'mode':<12}{'bytes':>9}{'ratio':>8}{'cpu us/req':>12}")
+
+        for name, accept, setting in configs():
+            if setting is not None:
+                setattr(compression, *setting)
+
+            def middleware_app():
+                return CompressionMiddleware(Response(raw, media_type="application/json"))
+
+            variants = CompressedVariants(raw)
+
+            def replay_app():
+                return PrecompressedResponse(variants, media_type="application/json")
+
+            for mode, make_app in (("middleware", middleware_app), ("replay", replay_app)):
+                wire, cpu = measure(make_app, accept, args.requests)
+                print(f"{name:<10}{mode:<12}{wire:>9}{wire / raw_size:>8.2f}{cpu * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# bench/bench_user_timeline.py
+"""
+작성자별 타임라인(GET /users/{id}/posts, /comments) 벤치마크.
+
+한 작성자에게 글/댓글을 10만 개 이상 넣고, 첫 페이지와 깊은 페이지(keyset)의
+응답 시간을 잰다. 비교용으로 같은 깊이의 OFFSET 페이지도 잰다.
+임시 SQLite 파일을 쓰므로 app.db 는 건드리지 않는다.
+
+실행:
+    python bench/bench_user_timeline.py --items 120000
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+_TMP = tempfile.mkdtemp(prefix="bench-timeline-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP, 'bench.db')}")
+
+from sqlalchemy import text  # noqa: E402
+
+from database import Base, engine, SessionLocal  # noqa: E402
+from db_models import User, Post, Comment  # noqa: E402
+from models import user_model  # noqa: E402
+
+BASE_TIME = datetime(2024, 1, 1)
+BATCH = 20_000
+
+
+def seed(items: int, noise: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": 1, "email": "heavy@bench.kr", "password": "x" * 8, "nickname": "heavy"},
+            {"id": 2, "email": "other@bench.kr", "password": "x" * 8, "nickname": "other"},
+        ])
+        for start in range(0, items + noise, BATCH):
+            conn.execute(Post.__table__.insert(), [
+                {
+                    "id": i + 1,
+                    "title": f"post {i}",
+                    "body": "본문 " * 200,
+                    "author_id": 1 if i < items else 2,
+                    "created_at": BASE_TIME + timedelta(seconds=i),
+                    "views": 0,
+                }
+                for i in range(start, min(start + BATCH, items + noise))
+            ])
+        for start in range(0, items + noise, BATCH):
+            conn.execute(Comment.__table__.insert(), [
+                {
+                    "id": i + 1,
+                    "post_id": (i % 1000) + 1,
+                    "author_id": 1 if i < items else 2,
+                    "content": f"comment {i}",
+                    "created_at": BASE_TIME + timedelta(seconds=i),
+                }
+                for i in range(start, min(start + BATCH, items + noise))
+            ])
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - begin)
+    return statistics.median(samples) * 1000
+
+
+def cursor_at(db, model, depth: int) -> str:
+    row = (
+        db.query(model.created_at, model.id)
+        .filter(model.author_id == 1)
+        .order_by(model.created_at.desc(), model.id.desc())
+        .offset(depth - 1)
+        .first()
+    )
+    return user_model._encode_cursor(row.created_at, row.id)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=120_000, help="작성자 1의 글/댓글 수")
+    parser.add_argument("--noise", type=int, default=50_000, help="다른 작성자의 글/댓글 수")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    seed(args.items, args.noise)
+    print(f"seeded {args.items} posts + {args.items} comments for author 1 "
+          f"(+{args.noise} each for author 2) in {time.perf_counter() - begin:.1f}s")
+
+    db = SessionLocal()
+    depth = args.items - args.limit
+
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT created_at, id FROM posts WHERE author_id = 1 "
+            "AND (created_at, id) < ('2030-01-01', 1) ORDER BY created_at DESC, id DESC LIMIT 21"
+        )).all()
+    print("plan:", "; ".join(row[-1] for row in plan))
+
+    print(f"{'query':<34}{'median ms':>10}")
+    for name, model, fetch in (
+        ("posts", Post, user_model.get_user_posts),
+        ("comments", Comment, user_model.get_user_comments),
+    ):
+        deep_cursor = cursor_at(db, model, depth)
+        first = timed(lambda: fetch(db, 1, None, args.limit), args.repeat)
+        deep = timed(lambda: fetch(db, 1, deep_cursor, args.limit), args.repeat)
+        offset = timed(lambda: (
+            db.query(model.id)
+            .filter(model.author_id == 1)
+            .order_by(model.created_at.desc(), model.id.desc())
+            .offset(depth)
+            .limit(args.limit)
+            .all()
+        ), args.repeat)
+        print(f"{name + ' first page (keyset)':<34}{first:>10.3f}")
+        print(f"{name + f' page at {depth} (keyset)':<34}{deep:>10.3f}")
+        print(f"{name + f' page at {depth} (OFFSET)':<34}{offset:>10.3f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        engine.dispose()
+        shutil.rmtree(_TMP, ignore_errors=True)
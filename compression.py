@@ -0,0 +1,160 @@
+# compression.py
+"""
+응답 압축 (gzip / brotli).
+
+- Accept-Encoding 협상, 최소 크기 미만은 압축하지 않음
+- Content-Length 가 있는(버퍼링된) 응답만 미들웨어에서 압축하고,
+  스트리밍 응답(SSE, NDJSON export)과 이미 인코딩된 응답은 그대로 통과
+- 애플리케이션 캐시에 있는 응답은 CompressedVariants 로 압축본을 같이 보관해서
+  적중할 때마다 다시 압축하지 않는다 (PrecompressedResponse)
+brotli 패키지가 없으면 gzip 만 쓴다.
+"""
+import gzip
+import os
+import threading
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+# 응답마다 압축하므로 압축률보다 CPU 비용을 우선한 레벨
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+_SKIP_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 헤더에서 쓸 인코딩을 고른다. (br > gzip, q=0 은 제외)"""
+    if not accept_encoding:
+        return None
+
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for enc in candidates:
+        q = accepted.get(enc, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressedVariants:
+    """원본 바이트 + 인코딩별 압축본 (처음 요청될 때 한 번만 압축)."""
+
+    __slots__ = ("body", "_variants", "_lock")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, encoding: str) -> bytes:
+        data = self._variants.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self._variants.get(encoding)
+                if data is None:
+                    data = compress(self.body, encoding)
+                    self._variants[encoding] = data
+        return data
+
+
+class PrecompressedResponse(Response):
+    """캐시된 응답용. 요청의 Accept-Encoding 에 맞는 압축본을 바로 보낸다."""
+
+    def __init__(self, variants: CompressedVariants, status_code: int = 200,
+                 headers: Optional[Dict[str, str]] = None, media_type: Optional[str] = None):
+        self.variants = variants
+        super().__init__(content=variants.body, status_code=status_code, headers=headers, media_type=media_type)
+
+    async def __call__(self, scope, receive, send):
+        if len(self.variants.body) >= COMPRESS_MIN_SIZE:
+            encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+            if encoding is not None:
+                self.body = self.variants.get(encoding)
+                self.headers["content-encoding"] = encoding
+                self.headers["content-length"] = str(len(self.body))
+            self.headers.add_vary_header("Accept-Encoding")
+        await super().__call__(scope, receive, send)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+        parts = []
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or "content-length" not in headers
+                    or content_type.startswith(_SKIP_CONTENT_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(parts)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
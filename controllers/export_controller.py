@@ -0,0 +1,58 @@
+# controllers/export_controller.py
+import json
+import zlib
+from typing import Optional
+from datetime import datetime
+
+from fastapi.responses import StreamingResponse
+
+from database import SessionLocal
+from models import post_model
+
+# 이 줄 수만큼 모아서 한 번에 내보낸다. (청크마다 write 호출 줄이기)
+LINES_PER_CHUNK = 500
+
+
+def _ndjson_stream(iter_rows, since_id: Optional[int], since_time: Optional[datetime], gzip: bool):
+    # 스트리밍은 응답이 끝날 때까지 이어지므로, 요청 의존성 세션 대신 전용 세션을 쓴다.
+    db = SessionLocal()
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None  # wbits=31: gzip 포맷
+    try:
+        buf = []
+        for row in iter_rows(db, since_id=since_id, since_time=since_time):
+            buf.append(json.dumps(row, ensure_ascii=False))
+            if len(buf) >= LINES_PER_CHUNK:
+                chunk = ("\n".join(buf) + "\n").encode("utf-8")
+                buf.clear()
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                yield chunk
+
+        tail = ("\n".join(buf) + "\n").encode("utf-8") if buf else b""
+        if compressor is not None:
+            tail = compressor.compress(tail) + compressor.flush()
+        if tail:
+            yield tail
+    finally:
+        db.close()
+
+
+def _export_response(iter_rows, since_id, since_time, gzip: bool):
+    headers = {"Cache-Control": "no-store"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _ndjson_stream(iter_rows, since_id, since_time, gzip),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+def export_posts_controller(since_id: Optional[int], since_time: Optional[datetime], gzip: bool):
+    return _export_response(post_model.iter_posts_export, since_id, since_time, gzip)
+
+
+def export_comments_controller(since_id: Optional[int], since_time: Optional[datetime], gzip: bool):
+    return _export_response(post_model.iter_comments_export, since_id, since_time, gzip)
@@ -1,5 +1,5 @@
 # controllers/post_controller.py
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from sqlalchemy.orm import Session
 from fastapi.responses import JSONResponse
@@ -7,9 +7,31 @@ from fastapi.responses import JSONResponse
 from models import post_model
 
 
-def list_posts_controller(db: Session, cursor: int, limit: int):
+def _rejected_response(result: Dict[str, Any]):
+    # 입장 제어에서 거절된 요청 (429: 속도 제한, 503: 추론 대기열 포화)
+    retry_after = result.get("retry_after")
+    return JSONResponse(
+        status_code=429 if result["error"] == "rate_limited" else 503,
+        content={
+            "message": result["error"],
+            "data": {"retry_after": retry_after},
+        },
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def list_posts_controller(db: Session, cursor: int, limit: int, fields: Optional[str] = None):
     try:
-        data = post_model.get_post_list(db, cursor, limit)
+        field_list = None
+        if fields is not None:
+            field_list = [f.strip() for f in fields.split(",") if f.strip()]
+
+        data = post_model.get_post_list(db, cursor, limit, field_list)
+        if data.get("error") == "invalid_request":
+            return JSONResponse(status_code=400, content={
+                "message": "invalid_request",
+                "data": {"field": data.get("field")},
+            })
         return JSONResponse(status_code=200, content={
             "message": "list_ok",
             "data": data,
@@ -21,6 +43,47 @@ def list_posts_controller(db: Session, cursor: int, limit: int):
         })
 
 
+def batch_posts_controller(db: Session, ids: Optional[List[int]]):
+    try:
+        result = post_model.get_post_batch(db, ids or [])
+        err = result.get("error")
+
+        if err == "invalid_request":
+            return JSONResponse(status_code=400, content={
+                "message": "invalid_request",
+                "data": None,
+            })
+        if err == "validation_error":
+            return JSONResponse(status_code=422, content={
+                "message": "validation_error",
+                "data": {"field": "ids", "reason": result.get("reason"), "max": result.get("max")},
+            })
+
+        return JSONResponse(status_code=200, content={
+            "message": "batch_ok",
+            "data": result,
+        })
+    except Exception:
+        return JSONResponse(status_code=500, content={
+            "message": "internal_server_error",
+            "data": None,
+        })
+
+
+def trending_posts_controller(db: Session, limit: int):
+    try:
+        data = post_model.get_trending_posts(db, limit)
+        return JSONResponse(status_code=200, content={
+            "message": "trending_ok",
+            "data": data,
+        })
+    except Exception:
+        return JSONResponse(status_code=500, content={
+            "message": "internal_server_error",
+            "data": None,
+        })
+
+
 def get_post_detail_controller(db: Session, post_id: int):
     try:
         detail = post_model.get_post_detail(db, post_id)
@@ -52,6 +115,9 @@ def create_post_controller(
         result = post_model.create_post(db, author_id, title, body)
         err = result.get("error")
 
+        if err in ("rate_limited", "overloaded"):
+            return _rejected_response(result)
+
         if err == "invalid_request":
             return JSONResponse(status_code=400, content={
                 "message": "invalid_request",
@@ -105,6 +171,9 @@ def create_comment_controller(
         result = post_model.create_comment(db, post_id, author_id, content)
         err = result.get("error")
 
+        if err in ("rate_limited", "overloaded"):
+            return _rejected_response(result)
+
         if err == "invalid_request":
             return JSONResponse(status_code=400, content={
                 "message": "invalid_request",
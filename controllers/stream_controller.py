@@ -0,0 +1,116 @@
+# controllers/stream_controller.py
+import asyncio
+import json
+import os
+from typing import Optional
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from models import post_model
+from models.comment_stream import broker
+
+HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+CATCH_UP_CHUNK = 500
+
+
+def _load(fn, *args):
+    # 스트리밍 중에는 요청 의존성 세션을 쓸 수 없으니 짧게 열고 닫는다.
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+def _sse(event: dict) -> bytes:
+    data = json.dumps(event, ensure_ascii=False)
+    return f"id: {event['comment_id']}\nevent: comment\ndata: {data}\n\n".encode("utf-8")
+
+
+async def _catch_up(post_id: int, last_id: int) -> list:
+    """last_id 이후 댓글을 DB에서 전부 읽는다. (CATCH_UP_CHUNK 단위)"""
+    events = []
+    while True:
+        chunk = await run_in_threadpool(_load, post_model.get_comments_after, post_id, last_id, CATCH_UP_CHUNK)
+        events.extend(chunk)
+        if len(chunk) < CATCH_UP_CHUNK:
+            return events
+        last_id = chunk[-1]["comment_id"]
+
+
+async def _comment_events(post_id: int, last_id: Optional[int]):
+    if last_id is None:
+        # 처음 연결: 기존 댓글은 건너뛰고 이 시점 이후 댓글부터 보낸다.
+        # 기준 id가 있어야 버퍼가 넘쳤을 때도 DB에서 따라잡을 수 있다.
+        last_id = await run_in_threadpool(_load, post_model.get_last_comment_id, post_id)
+
+    sub = broker.subscribe(post_id)
+    try:
+        # 구독을 먼저 걸고 DB를 읽어야 그 사이에 달린 댓글을 놓치지 않는다.
+        for event in await _catch_up(post_id, last_id):
+            last_id = event["comment_id"]
+            yield _sse(event)
+
+        while True:
+            if sub.lagged:
+                # 버퍼가 넘쳐 버려진 이벤트는 DB에서 다시 읽는다.
+                sub.lagged = False
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                for event in await _catch_up(post_id, last_id):
+                    last_id = event["comment_id"]
+                    yield _sse(event)
+                continue
+
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                # broker 는 프로세스 안에서만 전달되므로 다른 워커에서 달린 댓글은
+                # 여기서 DB를 다시 읽어 가져온다. (지연은 최대 HEARTBEAT_INTERVAL)
+                events = await _catch_up(post_id, last_id)
+                for event in events:
+                    last_id = event["comment_id"]
+                    yield _sse(event)
+                if not events:
+                    yield b": keep-alive\n\n"
+                continue
+
+            if event["comment_id"] <= last_id:
+                continue  # 따라잡기에서 이미 보낸 댓글
+            last_id = event["comment_id"]
+            yield _sse(event)
+    finally:
+        broker.unsubscribe(sub)
+
+
+async def comment_stream_controller(post_id: int, last_event_id: Optional[str]):
+    last_id = None
+    if last_event_id:
+        try:
+            last_id = int(last_event_id)
+        except ValueError:
+            return JSONResponse(status_code=400, content={
+                "message": "invalid_request",
+                "data": {"field": "Last-Event-ID"},
+            })
+
+    try:
+        exists = await run_in_threadpool(_load, post_model.post_exists, post_id)
+    except Exception:
+        return JSONResponse(status_code=500, content={
+            "message": "internal_server_error",
+            "data": None,
+        })
+    if not exists:
+        return JSONResponse(status_code=404, content={
+            "message": "not_found",
+            "data": None,
+        })
+
+    return StreamingResponse(
+        _comment_events(post_id, last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
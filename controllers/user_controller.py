@@ -1,5 +1,5 @@
 # controllers/user_controller.py
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from sqlalchemy.orm import Session
 from fastapi.responses import JSONResponse
@@ -144,3 +144,43 @@ def edit_password_controller(db: Session, payload: Dict[str, Any]):
             "message": "internal_server_error",
             "data": None,
         })
+
+
+def _timeline_response(result: Dict[str, Any], ok_message: str):
+    err = result.get("error")
+    if err == "not_found":
+        return JSONResponse(status_code=404, content={
+            "message": "not_found",
+            "data": None,
+        })
+    if err == "invalid_request":
+        return JSONResponse(status_code=400, content={
+            "message": "invalid_request",
+            "data": {"field": "cursor"},
+        })
+    return JSONResponse(status_code=200, content={
+        "message": ok_message,
+        "data": result,
+    })
+
+
+def user_posts_controller(db: Session, user_id: int, cursor: Optional[str], limit: int):
+    try:
+        result = user_model.get_user_posts(db, user_id, cursor, limit)
+        return _timeline_response(result, "user_posts_ok")
+    except Exception:
+        return JSONResponse(status_code=500, content={
+            "message": "internal_server_error",
+            "data": None,
+        })
+
+
+def user_comments_controller(db: Session, user_id: int, cursor: Optional[str], limit: int):
+    try:
+        result = user_model.get_user_comments(db, user_id, cursor, limit)
+        return _timeline_response(result, "user_comments_ok")
+    except Exception:
+        return JSONResponse(status_code=500, content={
+            "message": "internal_server_error",
+            "data": None,
+        })
@@ -1,9 +1,11 @@
 # database.py
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-# SQLite 파일 DB
-SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"
+# SQLite 파일 DB (테스트/벤치마크는 DATABASE_URL 로 다른 파일을 쓴다)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
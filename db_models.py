@@ -1,5 +1,5 @@
 # db_models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -20,6 +20,8 @@ class User(Base):
 
 class Post(Base):
     __tablename__ = "posts"
+    # 작성자별 타임라인 (author_id, created_at, id) 커버링 인덱스
+    __table_args__ = (Index("ix_posts_author_created", "author_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -34,6 +36,7 @@ class Post(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (Index("ix_comments_author_created", "author_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
@@ -43,3 +46,15 @@ class Comment(Base):
 
     post = relationship("Post", back_populates="comments")
     author = relationship("User")
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key 별 첫 응답 (워커 간 공유). status_code 가 NULL 이면 처리 중."""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(300), primary_key=True)
+    owner = Column(String(32), nullable=False)  # 처리 중인 요청의 토큰
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,198 @@
+# idempotency.py
+"""
+쓰기 요청의 Idempotency-Key 처리.
+
+같은 키로 다시 들어온 요청은 사용자 조회/AI 검사/INSERT 없이
+처음 응답을 그대로 돌려준다. 재시도는 보통 다른 워커로 들어오므로
+키는 공유 DB의 idempotency_keys 테이블에 저장한다.
+- INSERT 로 키를 선점 (기본키 충돌 = 이미 누가 처리 중이거나 처리 완료)
+- 처리 중인 키로 들어온 요청은 첫 요청이 끝날 때까지 기다렸다가 같은 응답을 돌려준다.
+  기다리는 동안은 SELECT 로만 확인하고, IDEMPOTENCY_WAIT 가 지나도 안 끝나면 409 + Retry-After.
+  기본값은 처리 시간의 최악값(사이드카 연결 + 응답 대기 = AI_SERVER_TIMEOUT 두 번)에 여유를 더한 값이다.
+  짧게 잡으면 스레드풀 스레드를 덜 붙잡지만, 정상적으로 끝날 요청의 재시도도 409 를 받게 된다.
+- 처리 중인 키는 IDEMPOTENCY_LOCK_TIMEOUT 이 지나면 버려진 것으로 보고 다시 선점할 수 있다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from compression import CompressedVariants, PrecompressedResponse
+from database import engine
+from db_models import IdempotencyKey
+
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+IDEMPOTENCY_LOCK_TIMEOUT = float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "60"))
+# models.ai_model 을 import 하면 모델을 로딩하므로 환경 변수를 직접 읽는다. (기본값 5초 동일)
+_AI_SERVER_TIMEOUT = float(os.getenv("AI_SERVER_TIMEOUT", "5.0"))
+IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", str(2 * _AI_SERVER_TIMEOUT + 5)))
+IDEMPOTENCY_POLL = 0.05
+PURGE_INTERVAL = 60.0
+# 재생(replay)할 때 쓰는 압축본 캐시 크기 (프로세스 단위)
+VARIANT_CACHE_SIZE = 1000
+MAX_KEY_LEN = 255
+
+_table = IdempotencyKey.__table__
+
+
+def _fingerprint(payload: Any) -> str:
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cacheable(status_code: int) -> bool:
+    # 일시적인 실패(속도 제한, 과부하, AI/서버 에러)는 재시도할 수 있어야 한다.
+    return status_code < 500 and status_code != 429
+
+
+class IdempotencyStore:
+    def __init__(self, bind=engine, ttl: float = IDEMPOTENCY_TTL,
+                 lock_timeout: float = IDEMPOTENCY_LOCK_TIMEOUT, wait: float = IDEMPOTENCY_WAIT):
+        self.bind = bind
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+        self._next_purge = 0.0
+        # (key, owner) -> CompressedVariants. 같은 응답을 재생할 때마다 다시 압축하지 않도록.
+        self._variants: "OrderedDict[tuple, CompressedVariants]" = OrderedDict()
+        self._variants_lock = threading.Lock()
+
+    def _purge(self, now: datetime):
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + PURGE_INTERVAL
+        with self.bind.begin() as conn:
+            conn.execute(delete(_table).where(_table.c.expires_at <= now))
+
+    def _claim(self, key: str, fingerprint: str):
+        """(owner 토큰, None) 이면 이 요청이 처리, (None, row) 면 기존 행."""
+        owner = uuid.uuid4().hex
+        now = datetime.utcnow()
+        self._purge(now)
+        try:
+            with self.bind.begin() as conn:
+                conn.execute(insert(_table).values(
+                    key=key,
+                    owner=owner,
+                    fingerprint=fingerprint,
+                    status_code=None,
+                    body=None,
+                    expires_at=now + timedelta(seconds=self.lock_timeout),
+                ))
+            return owner, None
+        except IntegrityError:
+            pass
+
+        with self.bind.begin() as conn:
+            row = conn.execute(select(_table).where(_table.c.key == key)).first()
+            if row is not None and row.expires_at <= now:
+                # 만료된 응답이거나 주인이 사라진 처리 중 키 -> 넘겨받는다.
+                taken = conn.execute(
+                    update(_table)
+                    .where(_table.c.key == key, _table.c.owner == row.owner)
+                    .values(
+                        owner=owner,
+                        fingerprint=fingerprint,
+                        status_code=None,
+                        body=None,
+                        expires_at=now + timedelta(seconds=self.lock_timeout),
+                    )
+                ).rowcount
+                if taken:
+                    return owner, None
+                row = conn.execute(select(_table).where(_table.c.key == key)).first()
+        return None, row
+
+    def _get(self, key: str):
+        with self.bind.connect() as conn:
+            return conn.execute(select(_table).where(_table.c.key == key)).first()
+
+    def _finish(self, key: str, owner: str, response: Optional[Response]):
+        with self.bind.begin() as conn:
+            mine = (_table.c.key == key) & (_table.c.owner == owner)
+            if response is not None and _cacheable(response.status_code):
+                conn.execute(update(_table).where(mine).values(
+                    status_code=response.status_code,
+                    body=bytes(response.body),
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+                ))
+            else:
+                # 저장하지 않는 결과: 키를 풀어서 다음 재시도가 새로 처리하게 한다.
+                conn.execute(delete(_table).where(mine))
+
+    def _replay(self, row) -> Response:
+        cache_key = (row.key, row.owner)
+        with self._variants_lock:
+            variants = self._variants.get(cache_key)
+            if variants is None:
+                variants = CompressedVariants(bytes(row.body))
+                self._variants[cache_key] = variants
+                if len(self._variants) > VARIANT_CACHE_SIZE:
+                    self._variants.popitem(last=False)
+            else:
+                self._variants.move_to_end(cache_key)
+        return PrecompressedResponse(
+            variants,
+            status_code=row.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def run(self, scope: str, key: Optional[str], payload: Any, handler: Callable[[], Response]) -> Response:
+        if key is None:
+            return handler()
+
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LEN:
+            return JSONResponse(status_code=400, content={
+                "message": "invalid_request",
+                "data": {"field": "Idempotency-Key"},
+            })
+
+        full_key = f"{scope}:{key}"
+        fingerprint = _fingerprint(payload)
+        deadline = time.monotonic() + self.wait
+
+        while True:
+            owner, row = self._claim(full_key, fingerprint)
+            if owner is not None:
+                response = None
+                try:
+                    response = handler()
+                    return response
+                finally:
+                    self._finish(full_key, owner, response)
+
+            # 기존 행이 있으면 SELECT 로만 지켜보다가, 풀리거나 만료되면 다시 선점을 시도한다.
+            # (대기 중에 INSERT 를 반복하면 첫 요청의 커밋과 쓰기 락을 다툰다)
+            while row is not None and row.expires_at > datetime.utcnow():
+                if row.fingerprint != fingerprint:
+                    return JSONResponse(status_code=422, content={
+                        "message": "idempotency_key_reused",
+                        "data": None,
+                    })
+
+                if row.status_code is not None:
+                    return self._replay(row)
+
+                # 같은 키의 첫 요청이 처리 중: 기다린다.
+                if time.monotonic() >= deadline:
+                    return JSONResponse(
+                        status_code=409,
+                        content={"message": "request_in_progress", "data": None},
+                        headers={"Retry-After": "1"},
+                    )
+                time.sleep(IDEMPOTENCY_POLL)
+                row = self._get(full_key)
+
+
+idempotency = IdempotencyStore()
@@ -1,16 +1,46 @@
 # main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 
-from database import Base, engine
+from database import Base, engine, SessionLocal
 from db_models import User, Post, Comment 
+from models import ranking
+from compression import CompressionMiddleware
 from routers.user_router import router as user_router
 from routers.post_router import router as post_router
+from routers.export_router import router as export_router
+from routers.metrics_router import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 인기글 랭킹: 시작 시 DB(+스냅샷)로 재구성하고, 주기적으로 스냅샷 저장
+    db = SessionLocal()
+    try:
+        ranking.ranking.rebuild(db, ranking.load_snapshot())
+    finally:
+        db.close()
+    stop_snapshot = ranking.start_snapshot_thread()
+
+    yield
+
+    stop_snapshot.set()
+    ranking.save_snapshot()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
 
 # 데모용: 앱 시작 시 테이블 생성
 Base.metadata.create_all(bind=engine)
+# 기존 DB 파일에도 나중에 추가된 인덱스 반영
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 app.include_router(post_router)
 app.include_router(user_router)
+app.include_router(export_router)
+app.include_router(metrics_router)
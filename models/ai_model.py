@@ -1,23 +1,248 @@
 # models/ai_model.py
 
 from __future__ import annotations
-from transformers import pipeline
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import List, Optional
 
 MODEL_NAME = "jinkyeongk/kcELECTRA-toxic-detector"
 
-# 전역 파이프라인 로딩
-try:
-    toxic_clf = pipeline(
-        "text-classification",
-        model=MODEL_NAME,
-        # top_k=1  # 기본값이라 생략 가능
-    )
-    _AI_MODEL_AVAILABLE = True
-except Exception as e:
-    # 모델 로딩 실패 시, 플래그만 False로 두고 나중에 처리
-    toxic_clf = None
-    _AI_MODEL_AVAILABLE = False
-    _AI_MODEL_LOAD_ERROR = str(e)
+# 추론 사이드카(models/ai_server.py) 설정
+# AI_SERVER_SOCKET 이 지정되면 웹 워커는 transformers/torch 를 import 하지 않고
+# 유닉스 도메인 소켓으로 사이드카에 추론을 요청한다.
+AI_SERVER_SOCKET = os.getenv("AI_SERVER_SOCKET")
+AI_SERVER_TIMEOUT = float(os.getenv("AI_SERVER_TIMEOUT", "5.0"))
+# 사이드카 장애 시 동작: "error"(기본, ai_error 반환) / "local"(프로세스 내 모델로 추론)
+AI_SERVER_FALLBACK = os.getenv("AI_SERVER_FALLBACK", "error")
+# 연속 실패가 AI_SERVER_MAX_FAILURES 번 쌓이면 이 시간(초) 동안 사이드카 접속을 쉰다.
+AI_SERVER_RETRY_AFTER = float(os.getenv("AI_SERVER_RETRY_AFTER", "3.0"))
+AI_SERVER_MAX_FAILURES = int(os.getenv("AI_SERVER_MAX_FAILURES", "5"))
+
+toxic_clf = None
+_AI_MODEL_AVAILABLE = False
+_AI_MODEL_LOAD_ERROR: Optional[str] = None
+_load_lock = threading.Lock()
+_load_attempted = False
+
+
+def load_local_model() -> bool:
+    """
+    프로세스 내 파이프라인을 (한 번만) 로딩한다.
+    성공 여부를 리턴.
+    """
+    global toxic_clf, _AI_MODEL_AVAILABLE, _AI_MODEL_LOAD_ERROR, _load_attempted
+
+    if _load_attempted:
+        return _AI_MODEL_AVAILABLE
+
+    with _load_lock:
+        if _load_attempted:
+            return _AI_MODEL_AVAILABLE
+        try:
+            from transformers import pipeline
+
+            toxic_clf = pipeline(
+                "text-classification",
+                model=MODEL_NAME,
+                # top_k=1  # 기본값이라 생략 가능
+            )
+            _AI_MODEL_AVAILABLE = True
+        except Exception as e:
+            # 모델 로딩 실패 시, 플래그만 False로 두고 나중에 처리
+            toxic_clf = None
+            _AI_MODEL_AVAILABLE = False
+            _AI_MODEL_LOAD_ERROR = str(e)
+        _load_attempted = True
+
+    return _AI_MODEL_AVAILABLE
+
+
+def _error_result(error: str) -> dict:
+    return {
+        "success": False,
+        "error": error,
+        "is_toxic": False,
+        "label": "AI_ERROR",
+        "score": 0.0,
+    }
+
+
+def _empty_result() -> dict:
+    return {
+        "success": True,
+        "error": None,
+        "is_toxic": False,
+        "label": "EMPTY",
+        "score": 0.0,
+    }
+
+
+def _label_result(label: str, score: float, threshold: float) -> dict:
+    return {
+        "success": True,
+        "error": None,
+        "is_toxic": (label == "LABEL_1") and (score >= threshold),
+        "label": label,
+        "score": score,
+    }
+
+
+def classify_batch(texts: List[str], thresholds: List[float]) -> List[dict]:
+    """
+    프로세스 내 모델로 여러 문장을 한 번에 추론한다. (사이드카에서 사용)
+    반환 형식은 check_toxic 과 같고, 입력 순서를 유지한다.
+    """
+    if not _AI_MODEL_AVAILABLE or toxic_clf is None:
+        error = _AI_MODEL_LOAD_ERROR or "model_not_available"
+        return [_error_result(error) for _ in texts]
+
+    results: List[Optional[dict]] = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            results[i] = _empty_result()
+        else:
+            pending.append(i)
+
+    if pending:
+        try:
+            outputs = toxic_clf([texts[i] for i in pending], batch_size=len(pending))
+            for i, out in zip(pending, outputs):
+                results[i] = _label_result(out["label"], float(out["score"]), thresholds[i])
+        except Exception as e:
+            # 추론 중 에러 (메모리 부족, 토치 내부 에러 등)
+            for i in pending:
+                results[i] = _error_result(str(e))
+
+    return results
+
+
+def _check_toxic_local(text: str, threshold: float) -> dict:
+    # 1) 모델이 아예 로딩되지 않은 경우
+    if not _AI_MODEL_AVAILABLE or toxic_clf is None:
+        return _error_result(_AI_MODEL_LOAD_ERROR or "model_not_available")
+
+    if not text or not text.strip():
+        return _empty_result()
+
+    try:
+        result = toxic_clf(text)[0]   # [{'label': 'LABEL_x', 'score': ...}]
+        return _label_result(result["label"], float(result["score"]), threshold)
+
+    except Exception as e:
+        # 추론 중 에러 (메모리 부족, 토치 내부 에러 등)
+        return _error_result(str(e))
+
+
+class _SidecarClient:
+    """
+    추론 사이드카 클라이언트.
+    스레드마다 소켓 연결 하나를 유지해서 요청마다 재접속하지 않는다.
+    프로토콜: 한 줄짜리 JSON 요청 {"text", "threshold"} -> 한 줄짜리 JSON 응답
+    """
+
+    def __init__(self, path: str, timeout: float):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+        self._failures = 0
+        self._failures_lock = threading.Lock()
+
+    def _connect(self):
+        # 타임아웃이 걸린 소켓의 connect 는 서버 listen 대기열이 꽉 차면
+        # 기다리지 않고 EAGAIN(BlockingIOError)으로 바로 실패한다. 잠깐씩 쉬면서 재시도.
+        deadline = time.monotonic() + self.timeout
+        delay = 0.005
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+                break
+            except BlockingIOError:
+                sock.close()
+                if time.monotonic() + delay > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+            except OSError:
+                sock.close()
+                raise
+        self._local.sock = sock
+        self._local.file = sock.makefile("rwb")
+        return self._local.file
+
+    def _close(self):
+        f = getattr(self._local, "file", None)
+        sock = getattr(self._local, "sock", None)
+        self._local.file = None
+        self._local.sock = None
+        for obj in (f, sock):
+            if obj is not None:
+                try:
+                    obj.close()
+                except OSError:
+                    pass
+
+    def classify(self, text: str, threshold: float) -> Optional[dict]:
+        """사이드카에 추론을 요청한다. 사용할 수 없으면 None."""
+        if time.monotonic() < self._down_until:
+            return None
+
+        line = json.dumps({"text": text, "threshold": threshold}).encode("utf-8") + b"\n"
+
+        # 재사용하던 연결이 끊겼을 수 있으니 한 번은 새로 연결해서 재시도
+        for attempt in range(2):
+            f = getattr(self._local, "file", None)
+            fresh = f is None
+            try:
+                if fresh:
+                    f = self._connect()
+                f.write(line)
+                f.flush()
+                raw = f.readline()
+                if not raw:
+                    raise ConnectionError("sidecar_closed")
+                result = json.loads(raw)
+            except socket.timeout:
+                # 응답 지연: 연결 상태를 알 수 없으니 버리고 재시도하지 않는다.
+                self._close()
+                break
+            except (OSError, ValueError):
+                self._close()
+                if fresh:
+                    break
+            else:
+                self._record(success=True)
+                return result
+
+        self._record(success=False)
+        return None
+
+    def _record(self, success: bool):
+        # 한 번 실패로 프로세스 전체를 막지 않도록, 연속 실패가 쌓였을 때만 잠시 쉰다.
+        with self._failures_lock:
+            if success:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= AI_SERVER_MAX_FAILURES:
+                self._failures = 0
+                self._down_until = time.monotonic() + AI_SERVER_RETRY_AFTER
+
+
+_sidecar: Optional[_SidecarClient] = (
+    _SidecarClient(AI_SERVER_SOCKET, AI_SERVER_TIMEOUT) if AI_SERVER_SOCKET else None
+)
+
+# 사이드카를 쓰지 않는 경우에만 import 시점에 전역 파이프라인 로딩
+if _sidecar is None:
+    load_local_model()
 
 
 def check_toxic(text: str, threshold: float = 0.5) -> dict:
@@ -32,46 +257,14 @@ def check_toxic(text: str, threshold: float = 0.5) -> dict:
       "score": float         # 해당 label의 score
     }
     """
-    # 1) 모델이 아예 로딩되지 않은 경우
-    if not _AI_MODEL_AVAILABLE or toxic_clf is None:
-        return {
-            "success": False,
-            "error": _AI_MODEL_LOAD_ERROR if '_AI_MODEL_LOAD_ERROR' in globals() else "model_not_available",
-            "is_toxic": False,
-            "label": "AI_ERROR",
-            "score": 0.0,
-        }
+    if _sidecar is None:
+        return _check_toxic_local(text, threshold)
 
-    if not text or not text.strip():
-        return {
-            "success": True,
-            "error": None,
-            "is_toxic": False,
-            "label": "EMPTY",
-            "score": 0.0,
-        }
-
-    try:
-        result = toxic_clf(text)[0]   # [{'label': 'LABEL_x', 'score': ...}]
-        label = result["label"]
-        score = float(result["score"])
+    result = _sidecar.classify(text, threshold)
+    if result is not None:
+        return result
 
-        is_toxic = (label == "LABEL_1") and (score >= threshold)
-
-        return {
-            "success": True,
-            "error": None,
-            "is_toxic": is_toxic,
-            "label": label,
-            "score": score,
-        }
-
-    except Exception as e:
-        # 추론 중 에러 (메모리 부족, 토치 내부 에러 등)
-        return {
-            "success": False,
-            "error": str(e),
-            "is_toxic": False,
-            "label": "AI_ERROR",
-            "score": 0.0,
-        }
+    # 사이드카 장애 시 폴백
+    if AI_SERVER_FALLBACK == "local" and load_local_model():
+        return _check_toxic_local(text, threshold)
+    return _error_result("ai_server_unavailable")
@@ -0,0 +1,131 @@
+# models/ai_server.py
+"""
+혐오 표현 분류 추론 사이드카.
+
+uvicorn 워커가 여러 개여도 모델은 이 프로세스에서 한 번만 로딩한다.
+워커들은 AI_SERVER_SOCKET 환경변수로 같은 소켓 경로를 지정하면
+models/ai_model.check_toxic 이 이 서버로 요청을 보낸다.
+
+실행 예시:
+    python -m models.ai_server --socket /tmp/ai_server.sock
+    AI_SERVER_SOCKET=/tmp/ai_server.sock uvicorn main:app --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+
+from models import ai_model
+
+DEFAULT_SOCKET = "/tmp/ai_server.sock"
+MAX_BATCH_SIZE = 16
+MAX_BATCH_WAIT = 0.005  # 첫 요청 이후 배치를 모으는 최대 대기 시간(초)
+
+
+class Batcher:
+    """요청들을 모아서 한 번의 파이프라인 호출로 추론한다."""
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_wait: float = MAX_BATCH_WAIT):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ai-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, threshold: float) -> Future:
+        fut: Future = Future()
+        self._queue.put((text, threshold, fut))
+        return fut
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [item[0] for item in batch]
+            thresholds = [item[1] for item in batch]
+            try:
+                results = ai_model.classify_batch(texts, thresholds)
+            except Exception as e:
+                results = [ai_model._error_result(str(e)) for _ in batch]
+
+            for (_, _, fut), result in zip(batch, results):
+                fut.set_result(result)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # 하나의 연결에서 여러 요청을 순서대로 처리 (클라이언트가 연결을 재사용)
+        for raw in self.rfile:
+            try:
+                req = json.loads(raw)
+                text = req.get("text") or ""
+                threshold = float(req.get("threshold", 0.5))
+            except (ValueError, TypeError, AttributeError):
+                result = ai_model._error_result("bad_request")
+            else:
+                result = self.server.batcher.submit(text, threshold).result()
+
+            self.wfile.write(json.dumps(result).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class AIServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    # 워커 여러 개가 동시에 접속해도 listen 대기열이 넘치지 않게 (기본값 5)
+    request_queue_size = 1024
+
+    def __init__(self, path: str, batcher: Batcher):
+        self.batcher = batcher
+        super().__init__(path, _Handler)
+
+
+def serve(
+    path: str = DEFAULT_SOCKET,
+    max_batch_size: int = MAX_BATCH_SIZE,
+    max_wait: float = MAX_BATCH_WAIT,
+    ready: threading.Event | None = None,
+):
+    """모델을 로딩하고 소켓 서버를 띄운다. (블로킹)"""
+    ai_model.load_local_model()
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = AIServer(path, Batcher(max_batch_size, max_wait))
+    if ready is not None:
+        ready.set()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="toxic classifier inference sidecar")
+    parser.add_argument("--socket", default=os.getenv("AI_SERVER_SOCKET", DEFAULT_SOCKET))
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_BATCH_WAIT * 1000)
+    args = parser.parse_args()
+
+    serve(args.socket, args.max_batch_size, args.max_wait_ms / 1000)
+
+
+if __name__ == "__main__":
+    main()
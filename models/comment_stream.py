@@ -0,0 +1,71 @@
+# models/comment_stream.py
+"""
+새 댓글 실시간 전달용 프로세스 내 pub/sub.
+
+create_comment(스레드풀에서 실행)가 커밋 후 publish 하면,
+구독 중인 SSE 연결(이벤트 루프의 코루틴)마다 제한된 크기의 큐로 전달한다.
+연결당 스레드는 쓰지 않는다.
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Set
+
+SUBSCRIBER_BUFFER = int(os.getenv("SSE_SUBSCRIBER_BUFFER", "100"))
+
+
+class Subscriber:
+    __slots__ = ("post_id", "loop", "queue", "lagged")
+
+    def __init__(self, post_id: int, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.post_id = post_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # 버퍼가 넘쳐서 이벤트를 버렸는지. 구독자는 DB에서 다시 따라잡는다.
+        self.lagged = False
+
+    def _push(self, event: Dict[str, Any]):
+        # 이벤트 루프 스레드에서만 호출된다.
+        if self.queue.full():
+            self.lagged = True
+            return
+        self.queue.put_nowait(event)
+
+
+class CommentBroker:
+    def __init__(self, buffer_size: int = SUBSCRIBER_BUFFER):
+        self.buffer_size = buffer_size
+        self._subs: Dict[int, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, post_id: int) -> Subscriber:
+        sub = Subscriber(post_id, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subs.setdefault(post_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            subs = self._subs.get(sub.post_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.post_id]
+
+    def publish(self, post_id: int, event: Dict[str, Any]):
+        """어느 스레드에서 호출해도 된다."""
+        with self._lock:
+            subs = list(self._subs.get(post_id, ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._push, event)
+            except RuntimeError:
+                # 이미 닫힌 이벤트 루프
+                self.unsubscribe(sub)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subs.values())
+
+
+broker = CommentBroker()
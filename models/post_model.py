@@ -1,13 +1,20 @@
 # models/post_model.py
+import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from db_models import Post, Comment, User
 from models.ai_model import check_toxic
+from models.ranking import ranking
+from models.comment_stream import broker
+from models.user_cache import user_cache
+from admission import admission, PRIORITY_POST, PRIORITY_COMMENT
 
 MAX_TITLE_LEN = 26
+BATCH_MAX_IDS = int(os.getenv("POST_BATCH_MAX_IDS", "100"))
 
 
 def _compact_count(n: int) -> str:
@@ -20,37 +27,160 @@ def _compact_count(n: int) -> str:
     return str(n)
 
 
-def get_post_list(db: Session, cursor: int, limit: int) -> Dict[str, Any]:
-    total = db.query(Post).count()
+# 목록 아이템마다 반복되던 표시용 상수 -> 응답 최상단에 한 번만
+LIST_COLORS = {"default": "#ACA0EB", "hover": "#7F6AEE"}
+LIST_FIELDS = ("id", "title", "created_at", "comments", "views", "author", "detail_url")
 
-    posts: List[Post] = (
-        db.query(Post)
-        .order_by(Post.id.asc())
-        .offset(cursor)
-        .limit(limit)
-        .all()
-    )
+
+def get_post_list(
+    db: Session,
+    cursor: int,
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    if fields is None:
+        fields = list(LIST_FIELDS)
+    elif not fields or any(f not in LIST_FIELDS for f in fields):
+        return {"error": "invalid_request", "field": "fields"}
+
+    total = db.query(func.count(Post.id)).scalar()
+
+    # body 같은 큰 컬럼은 읽지 않고, 필요한 컬럼만 한 번의 쿼리로 가져온다.
+    columns = [Post.id]
+    if "title" in fields:
+        columns.append(Post.title)
+    if "created_at" in fields:
+        columns.append(Post.created_at)
+    if "views" in fields:
+        columns.append(Post.views)
+    if "comments" in fields:
+        comments_count = (
+            select(func.count(Comment.id))
+            .where(Comment.post_id == Post.id)
+            .correlate(Post)
+            .scalar_subquery()
+        )
+        columns.append(comments_count.label("comments_count"))
+    if "author" in fields:
+        columns.append(User.nickname.label("author"))
+
+    q = db.query(*columns)
+    if "author" in fields:
+        q = q.outerjoin(User, User.id == Post.author_id)
+    rows = q.order_by(Post.id.asc()).offset(cursor).limit(limit).all()
 
     next_cursor = cursor + limit
     if next_cursor >= total:
         next_cursor = None
 
     items = []
-    for p in posts:
-        items.append({
-            "id": p.id,
-            "title": p.title if len(p.title) <= MAX_TITLE_LEN else p.title[:MAX_TITLE_LEN],
-            "created_at": p.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "comments": _compact_count(len(p.comments)),
-            "views": _compact_count(p.views),
-            "detail_url": f"/posts/{p.id}",
-            "colors": {"default": "#ACA0EB", "hover": "#7F6AEE"},
-        })
+    for r in rows:
+        item = {}
+        if "id" in fields:
+            item["id"] = r.id
+        if "title" in fields:
+            item["title"] = r.title if len(r.title) <= MAX_TITLE_LEN else r.title[:MAX_TITLE_LEN]
+        if "created_at" in fields:
+            item["created_at"] = r.created_at.strftime("%Y-%m-%d %H:%M:%S")
+        if "comments" in fields:
+            item["comments"] = _compact_count(r.comments_count)
+        if "views" in fields:
+            item["views"] = _compact_count(r.views)
+        if "author" in fields:
+            item["author"] = r.author or "unknown"
+        if "detail_url" in fields:
+            item["detail_url"] = f"/posts/{r.id}"
+        items.append(item)
 
     return {
         "items": items,
         "total": total,
         "next_cursor": next_cursor,
+        "colors": LIST_COLORS,
+    }
+
+
+def _post_summaries(db: Session, ids: List[int]) -> Dict[int, Any]:
+    """id 목록에 해당하는 글 요약(본문 제외)을 IN 쿼리 한 번으로 가져온다."""
+    if not ids:
+        return {}
+    comments_count = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    rows = (
+        db.query(
+            Post.id,
+            Post.title,
+            Post.created_at,
+            Post.views,
+            comments_count.label("comments_count"),
+            User.nickname.label("author"),
+        )
+        .outerjoin(User, User.id == Post.author_id)
+        .filter(Post.id.in_(ids))
+        .all()
+    )
+    return {r.id: r for r in rows}
+
+
+def get_post_batch(db: Session, ids: List[int]) -> Dict[str, Any]:
+    """
+    여러 글 요약을 한 번에 조회 (조회수는 올리지 않는다).
+    요청한 순서대로, 없는 id는 found=False 로 표시.
+    """
+    if not ids:
+        return {"error": "invalid_request"}
+    if len(ids) > BATCH_MAX_IDS:
+        return {"error": "validation_error", "reason": "too_many_ids", "max": BATCH_MAX_IDS}
+
+    rows = _post_summaries(db, list(set(ids)))
+
+    items = []
+    for pid in ids:
+        r = rows.get(pid)
+        if r is None:
+            items.append({"id": pid, "found": False})
+            continue
+        items.append({
+            "id": r.id,
+            "found": True,
+            "title": r.title,
+            "author": r.author or "unknown",
+            "created_at": r.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "views": r.views,
+            "comments_count": r.comments_count,
+            "detail_url": f"/posts/{r.id}",
+        })
+
+    return {"items": items}
+
+
+def get_trending_posts(db: Session, limit: int) -> Dict[str, Any]:
+    top = ranking.top(limit)
+    rows = _post_summaries(db, [pid for pid, _ in top])
+
+    items = []
+    for pid, score in top:
+        r = rows.get(pid)
+        if r is None:
+            continue
+        items.append({
+            "id": r.id,
+            "title": r.title if len(r.title) <= MAX_TITLE_LEN else r.title[:MAX_TITLE_LEN],
+            "created_at": r.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "comments": _compact_count(r.comments_count),
+            "views": _compact_count(r.views),
+            "author": r.author or "unknown",
+            "score": round(score, 3),
+            "detail_url": f"/posts/{r.id}",
+        })
+
+    return {
+        "items": items,
+        "colors": LIST_COLORS,
     }
 
 
@@ -59,9 +189,12 @@ def get_post_detail(db: Session, post_id: int) -> Optional[Dict[str, Any]]:
     if not post:
         return None
 
-    # 조회수 +1
-    post.views += 1
-    db.add(post)
+    # 조회수 +1 (워커 여러 개가 동시에 올려도 빠지지 않도록 DB에서 더한다)
+    # 랭킹은 커밋 전에 반영해야 주기적인 DB 동기화가 이 조회를 다른 워커 것으로 보고 또 세지 않는다.
+    ranking.record_view(post.id)
+    db.query(Post).filter(Post.id == post_id).update(
+        {Post.views: Post.views + 1}, synchronize_session=False
+    )
     db.commit()
     db.refresh(post)
 
@@ -89,12 +222,56 @@ def get_post_detail(db: Session, post_id: int) -> Optional[Dict[str, Any]]:
     }
 
 
+def _user_id(value: Any) -> Optional[int]:
+    """
+    요청 본문의 author_id 를 정수 id 로 바꾼다. (잘못된 값이면 None)
+    SQLite 는 "1", "01", " 1" 을 모두 1로 비교하므로, 캐시/속도 제한 키도 같은 값으로 맞춘다.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _moderate(author_id: int, priority: str, text: str) -> Dict[str, Any]:
+    """
+    입장 제어를 통과하면 check_toxic 결과, 거절되면
+    {"error": "rate_limited" | "overloaded", "retry_after": 초}.
+    """
+    decision = admission.try_admit(author_id, priority)
+    if not decision.admitted:
+        return {"error": decision.reason, "retry_after": decision.retry_after}
+    try:
+        return check_toxic(text, threshold=0.7)
+    finally:
+        admission.release(decision)
+
+
+def _author_nickname(db: Session, author_id: int) -> Optional[str]:
+    """작성자 닉네임 (없는 사용자면 None). 캐시를 먼저 본다."""
+    hit, nickname = user_cache.get(author_id)
+    if hit:
+        return nickname
+    row = db.query(User.nickname).filter(User.id == author_id).first()
+    nickname = row.nickname if row else None
+    user_cache.set(author_id, nickname)
+    return nickname
+
+
 def create_post(db: Session, author_id: int, title: str, body: str) -> Dict[str, Any]:
     title = (title or "").strip()
     body = (body or "").strip()
 
-    if not title or not body:
+    user_id = _user_id(author_id)
+    if (author_id is not None and user_id is None) or not title or not body:
         return {"error": "invalid_request"}
+    author_id = user_id
 
     if len(title) > MAX_TITLE_LEN:
         return {
@@ -104,12 +281,13 @@ def create_post(db: Session, author_id: int, title: str, body: str) -> Dict[str,
         }
 
     # 작성자 존재 여부
-    user = db.query(User).filter(User.id == author_id).first()
-    if not user:
+    if author_id is None or _author_nickname(db, author_id) is None:
         return {"error": "user_not_found"}
 
-    # AI 욕설/비도덕성 검사
-    moderation = check_toxic(f"{title}\n{body}", threshold=0.7)
+    # AI 욕설/비도덕성 검사 (검증/존재 확인을 통과한 요청만 입장 제어를 거쳐 추론)
+    moderation = _moderate(author_id, PRIORITY_POST, f"{title}\n{body}")
+    if "retry_after" in moderation:
+        return moderation
     if not moderation["success"]:
         return {"error": "ai_error", "detail": moderation["error"]}
     if moderation["is_toxic"]:
@@ -143,23 +321,41 @@ def create_comment(
     content: str,
 ) -> Dict[str, Any]:
     content = (content or "").strip()
-    if not content:
+    user_id = _user_id(author_id)
+    if (author_id is not None and user_id is None) or not content:
         return {"error": "invalid_request"}
+    author_id = user_id
 
     if len(content) > 500:
         return {"error": "validation_error"}
 
-    # 게시글, 작성자 존재 여부
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        return {"error": "not_found"}
+    if author_id is None:
+        return {"error": "user_not_found"}
 
-    user = db.query(User).filter(User.id == author_id).first()
-    if not user:
+    # 게시글, 작성자 존재 여부 (작성자가 캐시에 없으면 한 번의 쿼리로 같이 확인)
+    hit, nickname = user_cache.get(author_id)
+    if hit:
+        if not post_exists(db, post_id):
+            return {"error": "not_found"}
+    else:
+        row = db.execute(
+            select(
+                select(Post.id).where(Post.id == post_id).scalar_subquery(),
+                select(User.nickname).where(User.id == author_id).scalar_subquery(),
+            )
+        ).one()
+        nickname = row[1]
+        user_cache.set(author_id, nickname)
+        if row[0] is None:
+            return {"error": "not_found"}
+
+    if nickname is None:
         return {"error": "user_not_found"}
 
     # AI 검사
-    moderation = check_toxic(content, threshold=0.7)
+    moderation = _moderate(author_id, PRIORITY_COMMENT, content)
+    if "retry_after" in moderation:
+        return moderation
     if not moderation["success"]:
         return {"error": "ai_error", "detail": moderation["error"]}
     if moderation["is_toxic"]:
@@ -178,6 +374,13 @@ def create_comment(
     db.add(comment)
     db.commit()
     db.refresh(comment)
+    ranking.record_comment(post_id, comment.id)
+    broker.publish(post_id, {
+        "comment_id": comment.id,
+        "author": nickname,
+        "content": comment.content,
+        "created_at": comment.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+    })
 
     comments_count = db.query(Comment).filter(Comment.post_id == post_id).count()
 
@@ -186,3 +389,94 @@ def create_comment(
         "comments_count": comments_count,
         "comments_count_display": _compact_count(comments_count),
     }
+
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+def _iter_id_ranges(db: Session, columns, id_col, time_col, since_id, since_time, chunk_size):
+    """
+    id 구간 단위로 끊어서 읽는다. (OFFSET 없이 id > last_id)
+    ORM 엔티티 대신 컬럼 튜플만 yield_per 로 흘려보내서 테이블 크기와 무관하게 메모리가 일정하다.
+    """
+    last_id = since_id or 0
+    while True:
+        q = db.query(*columns).filter(id_col > last_id)
+        if since_time is not None:
+            q = q.filter(time_col >= since_time)
+
+        n = 0
+        for row in q.order_by(id_col.asc()).limit(chunk_size).yield_per(chunk_size):
+            n += 1
+            last_id = row.id
+            yield row
+
+        # 구간 사이에 읽기 트랜잭션을 끊어서 오래 잡고 있지 않게 한다.
+        db.rollback()
+        if n < chunk_size:
+            break
+
+
+def iter_posts_export(
+    db: Session,
+    since_id: Optional[int] = None,
+    since_time: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+):
+    columns = (Post.id, Post.title, Post.body, Post.author_id, Post.created_at, Post.views)
+    for row in _iter_id_ranges(db, columns, Post.id, Post.created_at, since_id, since_time, chunk_size):
+        yield {
+            "id": row.id,
+            "title": row.title,
+            "body": row.body,
+            "author_id": row.author_id,
+            "created_at": row.created_at.strftime("%Y-%m-%d %H:%M:%S") if row.created_at else None,
+            "views": row.views,
+        }
+
+
+def iter_comments_export(
+    db: Session,
+    since_id: Optional[int] = None,
+    since_time: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+):
+    columns = (Comment.id, Comment.post_id, Comment.author_id, Comment.content, Comment.created_at)
+    for row in _iter_id_ranges(db, columns, Comment.id, Comment.created_at, since_id, since_time, chunk_size):
+        yield {
+            "id": row.id,
+            "post_id": row.post_id,
+            "author_id": row.author_id,
+            "content": row.content,
+            "created_at": row.created_at.strftime("%Y-%m-%d %H:%M:%S") if row.created_at else None,
+        }
+
+
+def post_exists(db: Session, post_id: int) -> bool:
+    return db.query(Post.id).filter(Post.id == post_id).first() is not None
+
+
+def get_last_comment_id(db: Session, post_id: int) -> int:
+    """글의 마지막 댓글 id (없으면 0)"""
+    return db.query(func.max(Comment.id)).filter(Comment.post_id == post_id).scalar() or 0
+
+
+def get_comments_after(db: Session, post_id: int, after_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+    """after_id 이후 댓글 (id 오름차순). SSE 재연결(Last-Event-ID) 시 따라잡기용."""
+    rows = (
+        db.query(Comment.id, Comment.content, Comment.created_at, User.nickname)
+        .outerjoin(User, User.id == Comment.author_id)
+        .filter(Comment.post_id == post_id, Comment.id > after_id)
+        .order_by(Comment.id.asc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "comment_id": r.id,
+            "author": r.nickname or "unknown",
+            "content": r.content,
+            "created_at": r.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        for r in rows
+    ]
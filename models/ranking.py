@@ -0,0 +1,279 @@
+# models/ranking.py
+"""
+인기글(trending) 랭킹.
+
+조회/댓글 이벤트마다 점수를 증분 갱신하는 메모리 구조.
+점수는 시간에 따라 지수 감쇠하는데, 모든 글을 매번 다시 계산하지 않도록
+"forward decay" 방식(기준 시각 T0 기준으로 가중치를 키워서 더함)을 쓴다.
+이렇게 하면 시간이 흘러도 글 사이의 순서는 바뀌지 않으므로
+힙 하나로 상위 K개를 O(K log N) 에 꺼낼 수 있다.
+
+멀티 워커(uvicorn --workers N) 지원:
+- 랭킹은 워커마다 따로 들고 있고, 자기 워커의 조회/댓글은 즉시 반영한다.
+- 다른 워커에서 생긴 조회/댓글은 주기적인 DB 동기화(sync)로 반영한다.
+  조회 시각은 DB에 없으므로 늘어난 조회수는 동기화 구간의 가운데 시각으로 친다.
+- 댓글 점수는 스냅샷에 넣지 않고 시작할 때 항상 DB에서 created_at 기준으로 다시 만든다.
+- 스냅샷(조회 점수만)은 워커들이 같은 파일에 덮어쓴다. 동기화 덕분에 어느 워커의
+  스냅샷이든 전체 조회수를 반영하고 있으므로 마지막에 쓴 것을 그대로 써도 된다.
+"""
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from db_models import Post, Comment
+
+VIEW_WEIGHT = 1.0
+COMMENT_WEIGHT = 5.0
+HALF_LIFE = float(os.getenv("TRENDING_HALF_LIFE", str(6 * 3600)))  # 점수 반감기(초)
+SNAPSHOT_PATH = os.getenv("TRENDING_SNAPSHOT_PATH", "./trending_snapshot.json")
+SNAPSHOT_INTERVAL = float(os.getenv("TRENDING_SNAPSHOT_INTERVAL", "300"))
+SNAPSHOT_VERSION = 2
+# 시작 시 이 반감기 배수보다 오래된 댓글은 점수가 사실상 0이므로 읽지 않는다.
+COMMENT_WINDOW_HALF_LIVES = 10
+SYNC_CHUNK = 1000
+
+# exp() 오버플로 방지: 기준 시각에서 이만큼(반감기 배수) 멀어지면 기준을 옮긴다.
+_REBASE_AFTER = 60
+
+
+def _ts(dt: Optional[datetime], default: float) -> float:
+    # DB에는 utcnow() 로 만든 naive datetime 이 들어 있다.
+    return dt.replace(tzinfo=timezone.utc).timestamp() if dt else default
+
+
+class TrendingRanking:
+    def __init__(self, half_life: float = HALF_LIFE):
+        self.half_life = half_life
+        self.rate = math.log(2) / half_life
+        self.base_time = time.time()
+        self._scores: Dict[int, float] = {}       # post_id -> 기준 시각 기준 점수 (조회 + 댓글)
+        self._view_scores: Dict[int, float] = {}  # 그중 조회 점수 (스냅샷 대상)
+        self._views: Dict[int, int] = {}          # 반영한 조회수 (DB 조회수와 차이 계산용)
+        self._heap: List[Tuple[float, int]] = []  # (-점수, post_id), 지난 항목은 lazy 삭제
+        # 댓글 동기화: 이 id 이하는 반영 완료. 이 워커에서 직접 반영한 댓글은 건너뛴다.
+        self._comment_watermark = 0
+        self._live_comment_ids: Set[int] = set()
+        self._synced_at = time.time()
+        self._lock = threading.Lock()
+
+    def _weight(self, t: float) -> float:
+        return math.exp(self.rate * (t - self.base_time))
+
+    def _rebase(self, now: float):
+        factor = math.exp(-self.rate * (now - self.base_time))
+        self.base_time = now
+        self._scores = {pid: s * factor for pid, s in self._scores.items()}
+        self._view_scores = {pid: s * factor for pid, s in self._view_scores.items()}
+        self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self._heap = [(-s, pid) for pid, s in self._scores.items()]
+        heapq.heapify(self._heap)
+
+    def _add(self, post_id: int, amount: float, t: float, view: bool = False):
+        if self.rate * (t - self.base_time) > _REBASE_AFTER * math.log(2):
+            self._rebase(t)
+        delta = amount * self._weight(t)
+        if view:
+            self._view_scores[post_id] = self._view_scores.get(post_id, 0.0) + delta
+        score = self._scores.get(post_id, 0.0) + delta
+        self._scores[post_id] = score
+        heapq.heappush(self._heap, (-score, post_id))
+        # 지난 항목이 너무 많이 쌓이면 정리
+        if len(self._heap) > 2 * len(self._scores) + 64:
+            self._rebuild_heap()
+
+    def record_view(self, post_id: int, t: Optional[float] = None):
+        """조회 1건 반영. DB 조회수를 올리는 커밋보다 먼저 불러야 sync 가 두 번 세지 않는다."""
+        with self._lock:
+            self._views[post_id] = self._views.get(post_id, 0) + 1
+            self._add(post_id, VIEW_WEIGHT, t or time.time(), view=True)
+
+    def record_comment(self, post_id: int, comment_id: Optional[int] = None, t: Optional[float] = None):
+        with self._lock:
+            if comment_id is not None:
+                if comment_id <= self._comment_watermark:
+                    return  # 동기화에서 이미 반영
+                self._live_comment_ids.add(comment_id)
+            self._add(post_id, COMMENT_WEIGHT, t or time.time())
+
+    def top(self, k: int) -> List[Tuple[int, float]]:
+        """상위 k개 (post_id, 현재 시각 기준 점수)"""
+        with self._lock:
+            decay = math.exp(-self.rate * (time.time() - self.base_time))
+            result = []
+            popped = []
+            seen = set()
+            while self._heap and len(result) < k:
+                item = heapq.heappop(self._heap)
+                neg_score, pid = item
+                if pid in seen or self._scores.get(pid) != -neg_score:
+                    continue  # 갱신 전의 오래된 항목
+                seen.add(pid)
+                popped.append(item)
+                result.append((pid, -neg_score * decay))
+            for item in popped:
+                heapq.heappush(self._heap, item)
+            return result
+
+    # ---- 시작 시 재구성 / DB 동기화 / 스냅샷 ----
+
+    def rebuild(self, db: Session, snapshot: Optional[dict] = None):
+        """
+        DB에서 랭킹을 다시 만든다.
+        - 조회: 스냅샷이 있으면 그 조회 점수를 쓰고, 이후 늘어난 조회수는
+          스냅샷 시각과 지금의 가운데 시각으로 친다. 없으면 작성 시각에 몰아서 계산.
+        - 댓글: 감쇠 구간 안의 댓글을 created_at 기준으로 모두 다시 더한다.
+        """
+        if snapshot and snapshot.get("version") != SNAPSHOT_VERSION:
+            snapshot = None
+
+        with self._lock:
+            self._scores.clear()
+            self._view_scores.clear()
+            self._views.clear()
+            self._live_comment_ids.clear()
+            now = time.time()
+            snap_posts = {}
+            if snapshot:
+                self.base_time = snapshot["base_time"]
+                snap_posts = {int(pid): v for pid, v in snapshot["posts"].items()}
+                missed_at = (min(snapshot["saved_at"], now) + now) / 2
+            else:
+                self.base_time = now
+
+            for pid, created_at, views in db.query(Post.id, Post.created_at, Post.views).yield_per(1000):
+                views = views or 0
+                self._views[pid] = views
+                snap = snap_posts.get(pid)
+                if snap is not None:
+                    view_score, snap_views = snap
+                    self._view_scores[pid] = view_score
+                    self._scores[pid] = view_score
+                    new_views, t = views - snap_views, missed_at
+                else:
+                    new_views, t = views, _ts(created_at, now)
+                if new_views > 0:
+                    self._add(pid, VIEW_WEIGHT * new_views, t, view=True)
+
+            self._comment_watermark = db.query(func.max(Comment.id)).scalar() or 0
+            since = datetime.utcnow() - timedelta(seconds=self.half_life * COMMENT_WINDOW_HALF_LIVES)
+            q = (
+                db.query(Comment.post_id, Comment.created_at)
+                .filter(Comment.created_at >= since, Comment.id <= self._comment_watermark)
+            )
+            for pid, created_at in q.yield_per(1000):
+                self._add(pid, COMMENT_WEIGHT, _ts(created_at, now))
+
+            self._synced_at = now
+            self._rebuild_heap()
+
+    def sync(self, db: Session):
+        """다른 워커에서 생긴 조회/댓글을 DB에서 가져와 반영한다."""
+        now = time.time()
+        with self._lock:
+            missed_at = (self._synced_at + now) / 2
+
+        # 조회수는 SYNC_CHUNK 개씩 읽어서 반영한다. (글 전체를 메모리에 올리지 않도록)
+        chunk = []
+        for row in db.query(Post.id, Post.views).yield_per(SYNC_CHUNK):
+            chunk.append(row)
+            if len(chunk) >= SYNC_CHUNK:
+                self._sync_views(chunk, missed_at)
+                chunk = []
+        if chunk:
+            self._sync_views(chunk, missed_at)
+
+        comments = (
+            db.query(Comment.id, Comment.post_id, Comment.created_at)
+            .filter(Comment.id > self._comment_watermark)
+            .order_by(Comment.id.asc())
+            .yield_per(SYNC_CHUNK)
+        )
+        for cid, pid, created_at in comments:
+            with self._lock:
+                if cid <= self._comment_watermark:
+                    continue
+                if cid not in self._live_comment_ids:  # 이 워커에서 반영한 댓글은 건너뛴다
+                    self._add(pid, COMMENT_WEIGHT, _ts(created_at, now))
+                self._comment_watermark = cid
+
+        with self._lock:
+            self._live_comment_ids = {c for c in self._live_comment_ids if c > self._comment_watermark}
+            self._synced_at = now
+
+    def _sync_views(self, rows, t: float):
+        # _views 는 이 워커가 점수에 반영한 조회수. record_view 가 DB 커밋보다 먼저 올려 두므로
+        # DB 값에 들어 있는 이 워커의 조회는 _views 에도 이미 들어 있다. (두 번 세지 않음)
+        # 아직 커밋 전이라 _views 가 DB보다 앞서 있으면 그 글은 다음 동기화에서 맞춘다.
+        with self._lock:
+            for pid, db_views in rows:
+                new_views = (db_views or 0) - self._views.get(pid, 0)
+                if new_views > 0:
+                    self._views[pid] = db_views
+                    self._add(pid, VIEW_WEIGHT * new_views, t, view=True)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "version": SNAPSHOT_VERSION,
+                "base_time": self.base_time,
+                "saved_at": time.time(),
+                "posts": {
+                    # 조회가 없던 글도 넣어야 재시작 때 그 이후 조회를 작성 시각으로 몰아 치지 않는다.
+                    str(pid): [self._view_scores.get(pid, 0.0), views]
+                    for pid, views in self._views.items()
+                },
+            }
+
+
+ranking = TrendingRanking()
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(path: str = SNAPSHOT_PATH):
+    tmp = f"{path}.{os.getpid()}.tmp"  # 워커 여러 개가 동시에 써도 안전하게
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ranking.snapshot(), f)
+    os.replace(tmp, path)
+
+
+def sync_from_db():
+    db = SessionLocal()
+    try:
+        ranking.sync(db)
+    finally:
+        db.close()
+
+
+def start_snapshot_thread(interval: float = SNAPSHOT_INTERVAL) -> threading.Event:
+    """interval 초마다 DB 동기화 후 스냅샷을 저장하는 데몬 스레드. 리턴한 Event를 set 하면 멈춘다."""
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.wait(interval):
+            try:
+                sync_from_db()
+                save_snapshot()
+            except Exception:
+                # 다음 주기에 다시 시도
+                pass
+
+    threading.Thread(target=_loop, name="trending-snapshot", daemon=True).start()
+    return stop
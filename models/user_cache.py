@@ -0,0 +1,63 @@
+# models/user_cache.py
+"""
+쓰기 경로에서 쓰는 사용자 식별 정보 캐시 (id -> 존재 여부 / 닉네임).
+
+없는 id도 짧게 캐시한다(negative caching).
+프로필 수정/회원가입 시 무효화하고, 워커 간 불일치는 TTL 안에서만 허용한다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_NEGATIVE_TTL = float(os.getenv("USER_CACHE_NEGATIVE_TTL", "5"))
+USER_CACHE_MAX = int(os.getenv("USER_CACHE_MAX", "10000"))
+
+_MISS = (False, None)
+
+
+class UserIdentityCache:
+    def __init__(self, ttl: float = USER_CACHE_TTL, negative_ttl: float = USER_CACHE_NEGATIVE_TTL,
+                 max_size: int = USER_CACHE_MAX):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        # user_id -> (만료 시각, 닉네임 또는 None(없는 사용자))
+        self._entries: "OrderedDict[int, Tuple[float, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        (hit, nickname) 리턴.
+        hit=True, nickname=None 이면 "없는 사용자"로 캐시된 것.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return _MISS
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return _MISS
+            self._entries.move_to_end(user_id)
+            return True, entry[1]
+
+    def set(self, user_id: int, nickname: Optional[str]):
+        ttl = self.ttl if nickname is not None else self.negative_ttl
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, nickname)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserIdentityCache()
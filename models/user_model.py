@@ -1,11 +1,14 @@
 # models/user_model.py
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from db_models import User
+from db_models import User, Post, Comment
+from models.user_cache import user_cache
+from models.post_model import MAX_TITLE_LEN
 
 
 def create_user(
@@ -43,6 +46,8 @@ def create_user(
         return {"error": "email_conflict"}
 
     db.refresh(new_user)
+    # 가입 전에 없는 사용자로 캐시됐을 수 있는 id
+    user_cache.invalidate(new_user.id)
 
     return {"user_id": new_user.id}
 
@@ -93,6 +98,7 @@ def update_profile(
     db.add(user)
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user.id)
 
     return {
         "user_id": user.id,
@@ -125,3 +131,104 @@ def update_password(
     db.refresh(user)
 
     return {"user_id": user.id}
+
+
+def _encode_cursor(created_at: datetime, item_id: int) -> str:
+    return f"{created_at.isoformat()}_{item_id}"
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    try:
+        created_at, item_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except ValueError:
+        return None
+
+
+def _timeline_page(db: Session, model, user_id: int, cursor: Optional[str], limit: int):
+    """
+    (author_id, created_at, id) 인덱스만 타고 한 페이지의 (created_at, id) 를 가져온다.
+    최신순 keyset 페이지네이션: OFFSET 없이 마지막 항목 다음부터.
+    """
+    q = db.query(model.created_at, model.id).filter(model.author_id == user_id)
+    if cursor:
+        decoded = _decode_cursor(cursor)
+        if decoded is None:
+            return None
+        q = q.filter(tuple_(model.created_at, model.id) < tuple_(*decoded))
+
+    # limit + 1 개를 읽어서 다음 페이지 존재 여부 확인
+    keys = q.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(keys) > limit:
+        keys = keys[:limit]
+        next_cursor = _encode_cursor(*keys[-1])
+    return [k.id for k in keys], next_cursor
+
+
+def get_user_posts(db: Session, user_id: int, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    if not db.query(User.id).filter(User.id == user_id).first():
+        return {"error": "not_found"}
+
+    page = _timeline_page(db, Post, user_id, cursor, limit)
+    if page is None:
+        return {"error": "invalid_request"}
+    ids, next_cursor = page
+
+    # 본문은 빼고, 이번 페이지 글들만 PK로 가져온다.
+    rows = {}
+    if ids:
+        rows = {
+            r.id: r
+            for r in db.query(Post.id, Post.title, Post.created_at, Post.views).filter(Post.id.in_(ids))
+        }
+
+    items = []
+    for pid in ids:
+        r = rows[pid]
+        items.append({
+            "id": r.id,
+            "title": r.title if len(r.title) <= MAX_TITLE_LEN else r.title[:MAX_TITLE_LEN],
+            "created_at": r.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "views": r.views,
+            "detail_url": f"/posts/{r.id}",
+        })
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+    }
+
+
+def get_user_comments(db: Session, user_id: int, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    if not db.query(User.id).filter(User.id == user_id).first():
+        return {"error": "not_found"}
+
+    page = _timeline_page(db, Comment, user_id, cursor, limit)
+    if page is None:
+        return {"error": "invalid_request"}
+    ids, next_cursor = page
+
+    rows = {}
+    if ids:
+        rows = {
+            r.id: r
+            for r in db.query(Comment.id, Comment.post_id, Comment.content, Comment.created_at)
+            .filter(Comment.id.in_(ids))
+        }
+
+    items = []
+    for cid in ids:
+        r = rows[cid]
+        items.append({
+            "comment_id": r.id,
+            "post_id": r.post_id,
+            "content": r.content,
+            "created_at": r.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "detail_url": f"/posts/{r.post_id}",
+        })
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+    }
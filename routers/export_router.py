@@ -0,0 +1,38 @@
+# routers/export_router.py
+from typing import Optional
+from datetime import datetime
+
+from fastapi import APIRouter, Query
+
+from controllers.export_controller import (
+    export_posts_controller,
+    export_comments_controller,
+)
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/posts")
+def export_posts(
+    since_id: Optional[int] = Query(None, ge=0),
+    since_time: Optional[datetime] = Query(None),
+    gzip: bool = Query(False),
+):
+    """
+    전체 게시글을 NDJSON(한 줄에 JSON 하나)으로 스트리밍.
+    예시: /export/posts?since_id=1200&gzip=true
+    """
+    return export_posts_controller(since_id, since_time, gzip)
+
+
+@router.get("/comments")
+def export_comments(
+    since_id: Optional[int] = Query(None, ge=0),
+    since_time: Optional[datetime] = Query(None),
+    gzip: bool = Query(False),
+):
+    """
+    전체 댓글을 NDJSON 으로 스트리밍.
+    예시: /export/comments?since_time=2025-01-01T00:00:00
+    """
+    return export_comments_controller(since_id, since_time, gzip)
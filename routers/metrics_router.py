@@ -0,0 +1,12 @@
+# routers/metrics_router.py
+from fastapi import APIRouter
+
+from admission import admission
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/admission")
+def admission_metrics():
+    """쓰기 요청 입장 제어 통계 (허용/거절 건수, 진행 중인 추론 수)"""
+    return {"message": "metrics_ok", "data": admission.metrics()}
@@ -1,14 +1,20 @@
 # routers/post_router.py
-from fastapi import APIRouter, Depends, Query, Body
+from typing import Optional, List
+
+from fastapi import APIRouter, Depends, Query, Body, Header
 from sqlalchemy.orm import Session
 
 from database import get_db
 from controllers.post_controller import (
     list_posts_controller,
+    trending_posts_controller,
+    batch_posts_controller,
     get_post_detail_controller,
     create_post_controller,
     create_comment_controller,
 )
+from controllers.stream_controller import comment_stream_controller
+from idempotency import idempotency
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
@@ -17,9 +23,59 @@ router = APIRouter(prefix="/posts", tags=["Posts"])
 def list_posts(
     cursor: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=50),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    fields 예시: ?fields=id,title,views (생략하면 전체 필드)
+    """
+    return list_posts_controller(db, cursor, limit, fields)
+
+
+@router.get("/trending")
+def trending_posts(
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    조회수/댓글 활동 기반 인기글 (시간이 지날수록 점수 감쇠)
+    """
+    return trending_posts_controller(db, limit)
+
+
+def _parse_ids(raw) -> Optional[List[int]]:
+    try:
+        if isinstance(raw, str):
+            return [int(x) for x in raw.split(",") if x.strip()]
+        return [int(x) for x in raw]
+    except (TypeError, ValueError):
+        return None
+
+
+@router.get("/batch")
+def batch_posts(
+    ids: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    """
+    여러 글 요약 한 번에 조회 (조회수 증가 X)
+    예시: /posts/batch?ids=1,2,3
+    """
+    return batch_posts_controller(db, _parse_ids(ids))
+
+
+@router.post("/batch")
+def batch_posts_by_body(
+    payload: dict = Body(...),
     db: Session = Depends(get_db),
 ):
-    return list_posts_controller(db, cursor, limit)
+    """
+    Body 예시:
+    {
+      "ids": [1, 2, 3]
+    }
+    """
+    return batch_posts_controller(db, _parse_ids(payload.get("ids")))
 
 
 @router.get("/{post_id}")
@@ -33,6 +89,7 @@ def get_post_detail(
 @router.post("")
 def create_post(
     payload: dict = Body(...),
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     """
@@ -44,13 +101,17 @@ def create_post(
     }
     """
     author_id = payload.get("author_id")
-    return create_post_controller(db, author_id, payload)
+    return idempotency.run(
+        "create_post", idempotency_key, payload,
+        lambda: create_post_controller(db, author_id, payload),
+    )
 
 
 @router.post("/{post_id}/comments")
 def create_comment(
     post_id: int,
     payload: dict = Body(...),
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     """
@@ -60,4 +121,19 @@ def create_comment(
       "content": "댓글 내용"
     }
     """
-    return create_comment_controller(db, post_id, payload)
+    return idempotency.run(
+        f"create_comment:{post_id}", idempotency_key, payload,
+        lambda: create_comment_controller(db, post_id, payload),
+    )
+
+
+@router.get("/{post_id}/comments/stream")
+async def stream_comments(
+    post_id: int,
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    새 댓글 SSE 스트림 (조회수 증가 X)
+    재연결 시 Last-Event-ID 헤더로 마지막으로 받은 comment_id 이후부터 이어 받는다.
+    """
+    return await comment_stream_controller(post_id, last_event_id)
@@ -1,5 +1,7 @@
 # routers/user_router.py
-from fastapi import APIRouter, Depends, Body
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Body, Query, Header
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -8,13 +10,20 @@ from controllers.user_controller import (
     login_controller,
     edit_profile_controller,
     edit_password_controller,
+    user_posts_controller,
+    user_comments_controller,
 )
+from idempotency import idempotency
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.post("/signup")
-def signup(payload: dict = Body(...), db: Session = Depends(get_db)):
+def signup(
+    payload: dict = Body(...),
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
     """
     Body 예시:
     {
@@ -24,7 +33,10 @@ def signup(payload: dict = Body(...), db: Session = Depends(get_db)):
       "profile_image": "https://image.kr/img.jpg"
     }
     """
-    return signup_controller(db, payload)
+    return idempotency.run(
+        "signup", idempotency_key, payload,
+        lambda: signup_controller(db, payload),
+    )
 
 
 @router.post("/login")
@@ -63,3 +75,29 @@ def edit_password(payload: dict = Body(...), db: Session = Depends(get_db)):
     }
     """
     return edit_password_controller(db, payload)
+
+
+@router.get("/{user_id}/posts")
+def user_posts(
+    user_id: int,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    작성한 글 (최신순). 다음 페이지는 응답의 next_cursor 를 cursor 로 넘긴다.
+    """
+    return user_posts_controller(db, user_id, cursor, limit)
+
+
+@router.get("/{user_id}/comments")
+def user_comments(
+    user_id: int,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    작성한 댓글 (최신순). 다음 페이지는 응답의 next_cursor 를 cursor 로 넘긴다.
+    """
+    return user_comments_controller(db, user_id, cursor, limit)
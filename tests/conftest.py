@@ -0,0 +1,41 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 저장소의 app.db 를 건드리지 않도록 테스트 전용 DB 파일 사용
+_DB_DIR = tempfile.mkdtemp(prefix="community-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}")
+os.environ.setdefault("TRENDING_SNAPSHOT_PATH", os.path.join(_DB_DIR, "trending_snapshot.json"))
+
+
+@pytest.fixture
+def db():
+    """테이블을 비운 새 DB 세션."""
+    from database import Base, engine, SessionLocal
+    import db_models  # noqa: F401  (테이블 등록)
+
+    from models.user_cache import user_cache
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    user_cache.clear()  # 이전 테스트의 id 가 재사용되므로
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    import main
+
+    return TestClient(main.app)
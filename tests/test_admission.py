@@ -0,0 +1,98 @@
+# tests/test_admission.py
+from admission import AdmissionController, PRIORITY_POST, PRIORITY_COMMENT
+
+
+def test_comment_flood_leaves_global_tokens_for_posts():
+    ctl = AdmissionController(global_rate=0.0, global_burst=100, post_global_reserve=0.2)
+
+    admitted = 0
+    for author_id in range(200):
+        decision = ctl.try_admit(author_id, PRIORITY_COMMENT)
+        admitted += decision.admitted
+        ctl.release(decision)
+    assert admitted == 80
+
+    decision = ctl.try_admit("new_user", PRIORITY_POST)
+    assert decision.admitted
+    ctl.release(decision)
+
+
+def test_per_user_bucket_rejects_with_retry_after():
+    ctl = AdmissionController(user_rate=1.0, user_burst=2)
+    for _ in range(2):
+        ctl.release(ctl.try_admit(1, PRIORITY_COMMENT))
+
+    decision = ctl.try_admit(1, PRIORITY_COMMENT)
+    assert not decision.admitted
+    assert decision.status_code == 429
+    assert decision.retry_after >= 1
+
+
+def test_inflight_limit_reserves_slots_for_posts():
+    ctl = AdmissionController(max_inflight=3, post_reserved=1)
+    held = [ctl.try_admit(i, PRIORITY_COMMENT) for i in range(2)]
+    assert all(d.admitted for d in held)
+
+    rejected = ctl.try_admit(99, PRIORITY_COMMENT)
+    assert not rejected.admitted and rejected.status_code == 503
+
+    post = ctl.try_admit(100, PRIORITY_POST)
+    assert post.admitted
+    for d in held + [post]:
+        ctl.release(d)
+    assert ctl.inflight.inflight == 0
+
+
+def test_cheap_rejections_do_not_spend_admission(client, db, monkeypatch):
+    from db_models import User, Post
+    from models import post_model
+
+    ctl = AdmissionController()
+    monkeypatch.setattr(post_model, "admission", ctl)
+    monkeypatch.setattr(post_model, "check_toxic", lambda text, threshold=0.5: {
+        "success": True, "error": None, "is_toxic": False, "label": "LABEL_0", "score": 0.9,
+    })
+
+    user = User(email="a@b.c", password="12345678", nickname="n")
+    db.add(user)
+    db.commit()
+    post = Post(title="t", body="b", author_id=user.id, views=0)
+    db.add(post)
+    db.commit()
+
+    assert client.post(f"/posts/{post.id}/comments", json={"author_id": user.id, "content": ""}).status_code == 400
+    assert client.post("/posts/9999/comments", json={"author_id": user.id, "content": "hi"}).status_code == 404
+    assert client.post(f"/posts/{post.id}/comments", json={"author_id": 9999, "content": "hi"}).status_code == 404
+    assert client.post(f"/posts/{post.id}/comments", json={"content": "hi"}).status_code == 404
+    assert client.post("/posts", json={"author_id": 9999, "title": "t", "body": "b"}).status_code == 404
+    assert ctl.metrics()["counters"] == {}
+
+    assert client.post(f"/posts/{post.id}/comments", json={"author_id": user.id, "content": "hi"}).status_code == 201
+    assert ctl.metrics()["counters"] == {"comment.admitted": 1}
+    assert ctl.inflight.inflight == 0
+
+
+def test_user_bucket_is_keyed_on_resolved_user_id(client, db, monkeypatch):
+    from db_models import User, Post
+    from models import post_model
+
+    ctl = AdmissionController(user_rate=0.0, user_burst=5)
+    monkeypatch.setattr(post_model, "admission", ctl)
+    monkeypatch.setattr(post_model, "check_toxic", lambda text, threshold=0.5: {
+        "success": True, "error": None, "is_toxic": False, "label": "LABEL_0", "score": 0.9,
+    })
+
+    user = User(email="a@b.c", password="12345678", nickname="n")
+    db.add(user)
+    db.commit()
+    post = Post(title="t", body="b", author_id=user.id, views=0)
+    db.add(post)
+    db.commit()
+
+    url = f"/posts/{post.id}/comments"
+    for _ in range(5):
+        assert client.post(url, json={"author_id": user.id, "content": "hi"}).status_code == 201
+    for spelling in (str(user.id), f"0{user.id}", f" {user.id}", f"00{user.id}"):
+        assert client.post(url, json={"author_id": spelling, "content": "hi"}).status_code == 429
+    assert client.post(url, json={"author_id": "abc", "content": "hi"}).status_code == 400
+    assert client.post(url, json={"author_id": True, "content": "hi"}).status_code == 400
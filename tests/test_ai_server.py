@@ -0,0 +1,88 @@
+# tests/test_ai_server.py
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from models import ai_model, ai_server
+
+TEXTS = [
+    ("안녕하세요 좋은 글이네요", 0.7),
+    ("this is bad stuff", 0.7),
+    ("bad but under threshold", 0.95),
+    ("", 0.7),
+    ("   ", 0.5),
+]
+
+
+def _stub_pipeline(inputs, batch_size=None):
+    # "bad" 가 들어가면 LABEL_1(0.9), 아니면 LABEL_0(0.8)
+    def one(text):
+        if "bad" in text:
+            return {"label": "LABEL_1", "score": 0.9}
+        return {"label": "LABEL_0", "score": 0.8}
+
+    if isinstance(inputs, str):
+        return [one(inputs)]
+    return [one(t) for t in inputs]
+
+
+@pytest.fixture(scope="module")
+def sidecar():
+    saved = (ai_model.toxic_clf, ai_model._AI_MODEL_AVAILABLE, ai_model._load_attempted, ai_model._sidecar)
+    ai_model.toxic_clf = _stub_pipeline
+    ai_model._AI_MODEL_AVAILABLE = True
+    ai_model._load_attempted = True
+
+    # AF_UNIX 경로 길이 제한 때문에 짧은 임시 디렉터리 사용
+    tmpdir = tempfile.mkdtemp(prefix="ai")
+    path = os.path.join(tmpdir, "ai.sock")
+    ready = threading.Event()
+    threading.Thread(target=ai_server.serve, args=(path,), kwargs={"ready": ready}, daemon=True).start()
+    assert ready.wait(5)
+
+    ai_model._sidecar = ai_model._SidecarClient(path, timeout=5.0)
+    yield ai_model._sidecar
+
+    ai_model.toxic_clf, ai_model._AI_MODEL_AVAILABLE, ai_model._load_attempted, ai_model._sidecar = saved
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_sidecar_matches_in_process(sidecar):
+    for text, threshold in TEXTS:
+        assert ai_model.check_toxic(text, threshold) == ai_model._check_toxic_local(text, threshold)
+
+
+def test_sidecar_reuses_connection(sidecar):
+    ai_model.check_toxic("first", 0.5)
+    sock = sidecar._local.sock
+    ai_model.check_toxic("second", 0.5)
+    assert sidecar._local.sock is sock
+
+
+def test_sidecar_concurrent_clients(sidecar):
+    # 스레드마다 연결을 새로 맺으므로 동시 connect 가 몰린다.
+    cases = [TEXTS[i % len(TEXTS)] for i in range(400)]
+
+    def run(case):
+        text, threshold = case
+        return ai_model.check_toxic(text, threshold), ai_model._check_toxic_local(text, threshold)
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        results = list(pool.map(run, cases))
+
+    for remote, local in results:
+        assert remote == local
+
+
+def test_sidecar_unavailable_falls_back_to_error(monkeypatch):
+    client = ai_model._SidecarClient("/nonexistent/ai.sock", timeout=0.5)
+    monkeypatch.setattr(ai_model, "_sidecar", client)
+    monkeypatch.setattr(ai_model, "AI_SERVER_FALLBACK", "error")
+
+    result = ai_model.check_toxic("hello", 0.5)
+    assert result["success"] is False
+    assert result["error"] == "ai_server_unavailable"
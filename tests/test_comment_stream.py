@@ -0,0 +1,136 @@
+# tests/test_comment_stream.py
+import asyncio
+import threading
+
+import pytest
+
+from controllers import stream_controller
+from db_models import User, Post, Comment
+from models.comment_stream import broker
+
+
+@pytest.fixture
+def thread_post(db):
+    user = User(email="a@b.c", password="12345678", nickname="nick")
+    db.add(user)
+    db.commit()
+    post = Post(title="t", body="b", author_id=user.id, views=0)
+    db.add(post)
+    db.commit()
+    return db, user, post
+
+
+def _add_comment(db, post, user, content, publish=True):
+    comment = Comment(post_id=post.id, author_id=user.id, content=content)
+    db.add(comment)
+    db.commit()
+    if publish:
+        event = {"comment_id": comment.id, "author": user.nickname, "content": content, "created_at": "x"}
+        # create_comment 처럼 스레드풀(다른 스레드)에서 publish
+        t = threading.Thread(target=broker.publish, args=(post.id, event))
+        t.start()
+        t.join()
+    return comment
+
+
+def _event_id(chunk: bytes) -> int:
+    assert chunk.startswith(b"id: ")
+    return int(chunk.split(b"\n", 1)[0][4:])
+
+
+def test_new_comments_are_pushed(thread_post, monkeypatch):
+    db, user, post = thread_post
+    _add_comment(db, post, user, "old", publish=False)
+    monkeypatch.setattr(stream_controller, "HEARTBEAT_INTERVAL", 0.05)
+
+    async def scenario():
+        gen = stream_controller._comment_events(post.id, None)
+        assert await gen.__anext__() == b": keep-alive\n\n"  # 기존 댓글은 보내지 않는다
+        new = _add_comment(db, post, user, "new")
+        chunk = await gen.__anext__()
+        assert _event_id(chunk) == new.id
+        assert b'"content": "new"' in chunk
+        await gen.aclose()
+
+    asyncio.run(scenario())
+    assert broker.subscriber_count() == 0
+
+
+def test_last_event_id_resumes_from_table(thread_post):
+    db, user, post = thread_post
+    comments = [_add_comment(db, post, user, f"c{i}", publish=False) for i in range(4)]
+
+    async def scenario():
+        gen = stream_controller._comment_events(post.id, comments[1].id)
+        ids = [_event_id(await gen.__anext__()) for _ in range(2)]
+        await gen.aclose()
+        return ids
+
+    assert asyncio.run(scenario()) == [comments[2].id, comments[3].id]
+
+
+def test_lag_before_first_event_catches_up(thread_post, monkeypatch):
+    db, user, post = thread_post
+    monkeypatch.setattr(broker, "buffer_size", 2)
+    monkeypatch.setattr(stream_controller, "HEARTBEAT_INTERVAL", 0.05)
+
+    async def scenario():
+        gen = stream_controller._comment_events(post.id, None)
+        # keep-alive 를 내보낸 채 멈춰 있는 동안(아직 보낸 댓글 없음)
+        assert await gen.__anext__() == b": keep-alive\n\n"
+
+        # 버퍼(2)보다 많은 댓글이 한꺼번에 들어와서 일부가 버려진다.
+        new = [_add_comment(db, post, user, f"n{i}") for i in range(6)]
+        await asyncio.sleep(0.05)
+
+        ids = []
+        while len(ids) < len(new):
+            chunk = await gen.__anext__()
+            if chunk.startswith(b"id: "):
+                ids.append(_event_id(chunk))
+        await gen.aclose()
+        return ids, [c.id for c in new]
+
+    received, expected = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert received == expected
+
+
+def test_idle_subscribers_do_not_add_threads(thread_post):
+    db, user, post = thread_post
+
+    async def scenario():
+        before = threading.active_count()
+        gens = [stream_controller._comment_events(post.id, None) for _ in range(3000)]
+        tasks = [asyncio.ensure_future(g.__anext__()) for g in gens]
+        while broker.subscriber_count() < len(gens):
+            await asyncio.sleep(0.05)
+        after = threading.active_count()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for g in gens:
+            await g.aclose()
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    # DB 조회용 스레드풀(최대 40) 외에 연결마다 스레드가 생기면 안 된다.
+    assert after - before <= 40
+    assert broker.subscriber_count() == 0
+
+
+def test_comments_from_other_workers_arrive_on_heartbeat(thread_post, monkeypatch):
+    db, user, post = thread_post
+    monkeypatch.setattr(stream_controller, "HEARTBEAT_INTERVAL", 0.05)
+
+    async def scenario():
+        gen = stream_controller._comment_events(post.id, None)
+        assert await gen.__anext__() == b": keep-alive\n\n"
+        # 다른 워커에서 달린 댓글: DB에는 있지만 이 프로세스의 broker 로는 오지 않는다.
+        other = _add_comment(db, post, user, "from another worker", publish=False)
+        chunk = await gen.__anext__()
+        await gen.aclose()
+        return chunk, other.id
+
+    chunk, expected = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert _event_id(chunk) == expected
@@ -0,0 +1,96 @@
+# tests/test_export.py
+import gzip
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+
+from controllers.export_controller import _ndjson_stream
+from db_models import User, Post, Comment
+from models import post_model
+
+BASE_TIME = datetime(2025, 1, 1)
+
+
+def _seed_posts(db, start: int, count: int, author_id: int):
+    rows = [
+        {
+            "id": i,
+            "title": f"title {i}",
+            "body": "본문 " * 50,
+            "author_id": author_id,
+            "created_at": BASE_TIME + timedelta(seconds=i),
+            "views": i % 100,
+        }
+        for i in range(start, start + count)
+    ]
+    db.execute(Post.__table__.insert(), rows)
+    db.commit()
+
+
+def _user(db):
+    user = User(email="a@b.c", password="12345678", nickname="n")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _peak_stream_memory() -> tuple:
+    lines = 0
+    tracemalloc.start()
+    try:
+        for chunk in _ndjson_stream(post_model.iter_posts_export, None, None, False):
+            lines += chunk.count(b"\n")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, lines
+
+
+def test_export_memory_stays_flat(db):
+    user = _user(db)
+    _seed_posts(db, 1, 10_000, user.id)
+    small_peak, small_lines = _peak_stream_memory()
+
+    _seed_posts(db, 10_001, 90_000, user.id)
+    large_peak, large_lines = _peak_stream_memory()
+
+    assert small_lines == 10_000
+    assert large_lines == 100_000
+    # 테이블이 10배 커져도 최대 메모리는 거의 그대로여야 한다.
+    assert large_peak < small_peak * 1.5
+
+
+def test_export_since_id_and_since_time(client, db):
+    user = _user(db)
+    _seed_posts(db, 1, 2_500, user.id)
+
+    rows = [json.loads(line) for line in client.get("/export/posts?since_id=2000").text.splitlines()]
+    assert [r["id"] for r in rows] == list(range(2001, 2501))
+
+    since = (BASE_TIME + timedelta(seconds=2400)).isoformat()
+    rows = [json.loads(line) for line in client.get(f"/export/posts?since_time={since}").text.splitlines()]
+    assert [r["id"] for r in rows] == list(range(2400, 2501))
+
+
+def test_export_comments(client, db):
+    user = _user(db)
+    _seed_posts(db, 1, 3, user.id)
+    db.add_all([Comment(post_id=2, author_id=user.id, content=f"c{i}") for i in range(5)])
+    db.commit()
+
+    rows = [json.loads(line) for line in client.get("/export/comments?since_id=2").text.splitlines()]
+    assert [r["content"] for r in rows] == ["c2", "c3", "c4"]
+    assert all(r["post_id"] == 2 for r in rows)
+
+
+def test_export_gzip_stream_decodes(client, db):
+    user = _user(db)
+    _seed_posts(db, 1, 1_200, user.id)
+
+    with client.stream("GET", "/export/posts?gzip=true") as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        raw = b"".join(response.iter_raw())
+
+    rows = [json.loads(line) for line in gzip.decompress(raw).decode("utf-8").splitlines()]
+    assert [r["id"] for r in rows] == list(range(1, 1_201))
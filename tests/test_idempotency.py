@@ -0,0 +1,140 @@
+# tests/test_idempotency.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.responses import JSONResponse
+
+from idempotency import IdempotencyStore
+
+
+def _handler(calls, status_code=201, delay=0.0):
+    def run():
+        calls.append(1)
+        time.sleep(delay)
+        return JSONResponse(status_code=status_code, content={"message": "ok", "data": {"n": len(calls)}})
+    return run
+
+
+def test_replay_across_workers(db):
+    # 워커 두 개 = 같은 DB를 보는 저장소 두 개
+    worker_a, worker_b = IdempotencyStore(), IdempotencyStore()
+    calls = []
+
+    first = worker_a.run("create_post", "k1", {"title": "t"}, _handler(calls))
+    retry = worker_b.run("create_post", "k1", {"title": "t"}, _handler(calls))
+
+    assert len(calls) == 1
+    assert retry.status_code == first.status_code == 201
+    assert retry.body == first.body
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+def test_concurrent_duplicates_run_once(db):
+    stores = [IdempotencyStore(), IdempotencyStore()]
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def run(i):
+        barrier.wait()
+        return stores[i % 2].run("signup", "same", {"email": "a@b.c"}, _handler(calls, delay=0.3))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(run, range(8)))
+
+    assert len(calls) == 1
+    assert {r.status_code for r in responses} == {201}
+    assert sum(r.headers.get("idempotent-replayed") == "true" for r in responses) == 7
+
+
+def test_key_reuse_with_different_body_is_rejected(db):
+    store = IdempotencyStore()
+    store.run("signup", "k", {"email": "a@b.c"}, _handler([]))
+    assert store.run("signup", "k", {"email": "other@b.c"}, _handler([])).status_code == 422
+
+
+def test_retryable_results_are_not_stored(db):
+    store = IdempotencyStore()
+    calls = []
+    assert store.run("create_post", "k", {}, _handler(calls, status_code=502)).status_code == 502
+    assert store.run("create_post", "k", {}, _handler(calls)).status_code == 201
+    assert len(calls) == 2
+
+
+def test_waiting_duplicate_gives_up_quickly(db):
+    store = IdempotencyStore(wait=0.2)
+    calls = []
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        return _handler(calls, delay=1.0)()
+
+    t = threading.Thread(target=store.run, args=("create_post", "k", {}, slow))
+    t.start()
+    started.wait()
+
+    begin = time.monotonic()
+    response = store.run("create_post", "k", {}, _handler(calls))
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
+    assert time.monotonic() - begin < 0.8
+    t.join()
+    assert len(calls) == 1
+
+
+def test_abandoned_in_flight_key_is_taken_over(db):
+    store = IdempotencyStore(lock_timeout=0.0)
+    owner, _ = store._claim("create_post:k", "fp")
+    assert owner is not None
+
+    calls = []
+    assert store.run("create_post", "k", {}, _handler(calls)).status_code == 201
+    assert len(calls) == 1
+
+
+def test_signup_retry_replays_without_insert(client, db):
+    from db_models import User
+
+    body = {"email": "a@b.c", "password": "12345678", "nickname": "n"}
+    first = client.post("/users/signup", json=body, headers={"Idempotency-Key": "signup-1"})
+    retry = client.post("/users/signup", json=body, headers={"Idempotency-Key": "signup-1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert db.query(User).count() == 1
+
+
+def test_waiting_duplicate_polls_without_writes(db):
+    first_store, waiter = IdempotencyStore(), IdempotencyStore(wait=2.0)
+    calls = []
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        return _handler(calls, delay=0.5)()
+
+    t = threading.Thread(target=first_store.run, args=("create_post", "k", {}, slow))
+    t.start()
+    started.wait()
+
+    claims = []
+    real_claim = waiter._claim
+    waiter._claim = lambda *args: claims.append(1) or real_claim(*args)
+    response = waiter.run("create_post", "k", {}, _handler(calls))
+    t.join()
+
+    assert response.status_code == 201
+    assert response.headers["idempotent-replayed"] == "true"
+    assert len(claims) == 1  # INSERT 시도는 처음 한 번뿐, 이후에는 SELECT 로만 기다린다
+    assert len(calls) == 1
+
+
+def test_default_wait_covers_worst_case_handler_time():
+    from idempotency import IDEMPOTENCY_LOCK_TIMEOUT
+    from models.ai_model import AI_SERVER_TIMEOUT
+
+    wait = IdempotencyStore().wait
+    # 사이드카 연결 + 응답 대기가 모두 타임아웃까지 걸려도 중복 요청은 첫 응답을 받아야 한다.
+    assert 2 * AI_SERVER_TIMEOUT < wait < IDEMPOTENCY_LOCK_TIMEOUT
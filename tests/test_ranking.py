@@ -0,0 +1,169 @@
+# tests/test_ranking.py
+from datetime import datetime, timedelta
+
+from db_models import User, Post, Comment
+from models.ranking import TrendingRanking, COMMENT_WEIGHT
+
+
+def _seed(db, n_posts=3):
+    user = User(email="a@b.c", password="12345678", nickname="n")
+    db.add(user)
+    db.commit()
+    posts = [Post(title=f"t{i}", body="b", author_id=user.id, views=0) for i in range(n_posts)]
+    db.add_all(posts)
+    db.commit()
+    return user, posts
+
+
+def _comment(db, user, post, created_at=None):
+    c = Comment(post_id=post.id, author_id=user.id, content="c", created_at=created_at or datetime.utcnow())
+    db.add(c)
+    db.commit()
+    return c
+
+
+def _scores(r):
+    return dict(r.top(100))
+
+
+def test_restart_keeps_comments_from_every_worker(db):
+    user, (p1, p2, _) = _seed(db)
+    worker_a, worker_b = TrendingRanking(), TrendingRanking()
+    worker_a.rebuild(db)
+    worker_b.rebuild(db)
+
+    # 워커 A, B 가 번갈아 댓글을 받는다. B 가 마지막으로 스냅샷을 쓴다.
+    for _ in range(3):
+        c = _comment(db, user, p1)
+        worker_a.record_comment(p1.id, c.id)
+        c = _comment(db, user, p2)
+        worker_b.record_comment(p2.id, c.id)
+    snapshot = worker_b.snapshot()
+
+    restarted = TrendingRanking()
+    restarted.rebuild(db, snapshot)
+    scores = _scores(restarted)
+    assert abs(scores[p1.id] - 3 * COMMENT_WEIGHT) < 0.01
+    assert abs(scores[p2.id] - 3 * COMMENT_WEIGHT) < 0.01
+
+
+def test_sync_picks_up_other_workers_without_double_counting(db):
+    user, (p1, p2, _) = _seed(db)
+    worker_a, worker_b = TrendingRanking(), TrendingRanking()
+    worker_a.rebuild(db)
+    worker_b.rebuild(db)
+
+    c = _comment(db, user, p1)
+    worker_a.record_comment(p1.id, c.id)
+    p2.views += 4
+    db.commit()
+    for _ in range(4):
+        worker_b.record_view(p2.id)
+
+    worker_a.sync(db)
+    worker_b.sync(db)
+    for worker in (worker_a, worker_b):
+        scores = _scores(worker)
+        assert abs(scores[p1.id] - COMMENT_WEIGHT) < 0.01
+        assert abs(scores[p2.id] - 4) < 0.01
+
+    # 두 번째 동기화는 아무것도 더하지 않는다.
+    before = _scores(worker_a)
+    worker_a.sync(db)
+    after = _scores(worker_a)
+    assert all(abs(after[pid] - s) < 0.01 for pid, s in before.items())
+
+
+def test_snapshot_views_are_not_credited_at_restart_time(db):
+    user, (p1, _, _) = _seed(db)
+    r = TrendingRanking(half_life=3600)
+    r.rebuild(db)
+    snapshot = r.snapshot()
+    # 스냅샷 이후 두 반감기 동안 다른 워커가 조회 8건을 받았다.
+    snapshot["saved_at"] -= 2 * 3600
+    snapshot["base_time"] -= 2 * 3600
+    p1.views = 8
+    db.commit()
+
+    restarted = TrendingRanking(half_life=3600)
+    restarted.rebuild(db, snapshot)
+    score = _scores(restarted)[p1.id]
+    # 구간 가운데(1 반감기 전)로 치므로 8이 아니라 4 근처
+    assert 3.9 < score < 4.1
+
+
+def test_rebuild_skips_comments_outside_decay_window(db):
+    user, (p1, _, _) = _seed(db)
+    r = TrendingRanking(half_life=60)
+    _comment(db, user, p1, created_at=datetime.utcnow() - timedelta(days=1))
+    r.rebuild(db)
+    assert p1.id not in _scores(r)
+
+
+def test_local_view_racing_with_sync_is_counted_once(db):
+    user, (p1, _, _) = _seed(db)
+    r = TrendingRanking()
+    r.rebuild(db)
+
+    # get_post_detail 순서: 랭킹 반영 -> (이 사이에 동기화) -> DB 커밋
+    r.record_view(p1.id)
+    r.sync(db)
+    p1.views += 1
+    db.commit()
+    r.sync(db)
+    assert abs(_scores(r)[p1.id] - 1) < 0.01
+
+    # 다른 워커의 조회는 그대로 들어온다.
+    p1.views += 2
+    db.commit()
+    r.sync(db)
+    assert abs(_scores(r)[p1.id] - 3) < 0.01
+
+
+def test_sync_reads_posts_in_chunks(db, monkeypatch):
+    from models import ranking as ranking_module
+
+    user, posts = _seed(db, n_posts=7)
+    r = TrendingRanking()
+    r.rebuild(db)
+    for p in posts:
+        p.views = 2
+    db.commit()
+
+    batches = []
+    real = r._sync_views
+    monkeypatch.setattr(ranking_module, "SYNC_CHUNK", 3)
+    monkeypatch.setattr(r, "_sync_views", lambda rows, t: batches.append(len(rows)) or real(rows, t))
+    r.sync(db)
+
+    assert batches == [3, 3, 1]
+    assert all(abs(s - 2) < 0.01 for s in _scores(r).values())
+
+
+def test_post_detail_view_is_not_double_counted_by_sync(client, db, monkeypatch):
+    from database import SessionLocal
+    from models import post_model
+
+    user, (p1, _, _) = _seed(db)
+    r = TrendingRanking()
+    r.rebuild(db)
+    monkeypatch.setattr(post_model, "ranking", r)
+
+    # 조회 요청 처리 도중 스냅샷 스레드의 동기화가 끼어든다.
+    real_record_view = r.record_view
+
+    def record_view_with_sync(post_id, t=None):
+        other = SessionLocal()
+        try:
+            r.sync(other)
+        finally:
+            other.close()
+        real_record_view(post_id, t)
+
+    monkeypatch.setattr(r, "record_view", record_view_with_sync)
+
+    assert client.get(f"/posts/{p1.id}").status_code == 200
+    r.sync(db)
+    db.expire_all()
+    assert db.get(Post, p1.id).views == 1
+    assert abs(_scores(r)[p1.id] - 1) < 0.01
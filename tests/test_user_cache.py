@@ -0,0 +1,94 @@
+# tests/test_user_cache.py
+import asyncio
+import json
+
+from sqlalchemy import event
+
+from controllers import stream_controller
+from database import engine
+from db_models import User, Post
+from models import post_model
+from models.user_cache import user_cache
+
+_ALLOW = {"success": True, "error": None, "is_toxic": False, "label": "LABEL_0", "score": 0.9}
+
+
+def _no_ai(monkeypatch):
+    monkeypatch.setattr(post_model, "check_toxic", lambda text, threshold=0.5: _ALLOW)
+
+
+def test_missing_id_is_valid_right_after_signup(client, db, monkeypatch):
+    _no_ai(monkeypatch)
+    body = {"title": "t", "body": "b"}
+
+    # 아직 없는 id 1 이 "없는 사용자"로 캐시된다.
+    assert client.post("/posts", json={"author_id": 1, **body}).status_code == 404
+    assert user_cache.get(1) == (True, None)
+
+    signup = client.post("/users/signup", json={"email": "a@b.c", "password": "12345678", "nickname": "n"})
+    assert signup.status_code == 201
+    assert signup.json()["data"]["user_id"] == 1
+
+    # negative TTL 이 지나기 전이라도 바로 글을 쓸 수 있어야 한다.
+    assert client.post("/posts", json={"author_id": 1, **body}).status_code == 201
+
+
+def test_nickname_change_shows_in_next_comment_event(client, db, monkeypatch):
+    _no_ai(monkeypatch)
+    user = User(email="a@b.c", password="12345678", nickname="before")
+    db.add(user)
+    db.commit()
+    post = Post(title="t", body="b", author_id=user.id, views=0)
+    db.add(post)
+    db.commit()
+    url = f"/posts/{post.id}/comments"
+
+    assert client.post(url, json={"author_id": user.id, "content": "first"}).status_code == 201
+    assert user_cache.get(user.id) == (True, "before")
+
+    assert client.patch("/users/profile", json={"user_id": user.id, "nickname": "after"}).status_code == 200
+
+    async def scenario():
+        gen = stream_controller._comment_events(post.id, None)
+        first = asyncio.ensure_future(gen.__anext__())
+        await asyncio.sleep(0.05)  # 구독이 걸릴 때까지
+        await asyncio.to_thread(client.post, url, json={"author_id": user.id, "content": "second"})
+        chunk = await first
+        await gen.aclose()
+        return chunk
+
+    chunk = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    data = json.loads(chunk.split(b"data: ", 1)[1])
+    assert data["content"] == "second"
+    assert data["author"] == "after"
+
+
+def test_cache_miss_comment_checks_post_and_user_in_one_select(db, monkeypatch):
+    _no_ai(monkeypatch)
+    user = User(email="a@b.c", password="12345678", nickname="n")
+    db.add(user)
+    db.commit()
+    post = Post(title="t", body="b", author_id=user.id, views=0)
+    db.add(post)
+    db.commit()
+    user_id, post_id = user.id, post.id
+    user_cache.clear()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = post_model.create_comment(db, post_id, user_id, "hi")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert "comment_id" in result
+    # INSERT 전에 실행된 것이 게시글/작성자 존재 확인이다.
+    checks = statements[:next(i for i, s in enumerate(statements) if s.startswith("INSERT"))]
+    assert len(checks) == 1
+    assert "POSTS" in checks[0] and "USERS" in checks[0]
+    # 사용자 확인 결과는 캐시되어 다음 요청은 DB 없이 작성자를 안다.
+    assert user_cache.get(user_id) == (True, "n")